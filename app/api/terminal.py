@@ -6,6 +6,8 @@
 from fastapi import APIRouter, Request, WebSocket, Query, HTTPException, Depends
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+from ..config import config
 from ..services.k8s_service import k8s_service
 from ..services.database import db_service
 from ..handlers.websocket_handler import create_websocket_handler
@@ -17,8 +19,10 @@ from datetime import datetime
 # 创建路由器
 router = APIRouter(tags=["terminal"])
 
-# 模板配置
+# 模板配置：启用字节码缓存，生产环境不再逐次检查模板文件修改时间
 templates = Jinja2Templates(directory="templates")
+templates.env.bytecode_cache = FileSystemBytecodeCache()
+templates.env.auto_reload = config.server.template_auto_reload
 
 # 创建WebSocket处理器
 websocket_handler = create_websocket_handler(k8s_service, db_service)
@@ -44,7 +48,7 @@ async def connect_to_pod(
 
     try:
         # 验证Pod是否存在
-        if not k8s_service.check_pod_exists(namespace, podname):
+        if not await k8s_service.check_pod_exists(namespace, podname):
             raise HTTPException(
                 status_code=404,
                 detail=f"Pod '{podname}' 在命名空间 '{namespace}' 中不存在",
@@ -4,10 +4,36 @@
 """
 
 import os
+import functools
 from dataclasses import dataclass
 from typing import Dict, Any
 
 
+# 环境变量在进程启动后不会变化，读取结果可以缓存
+@functools.cache
+def _get_str(name: str, default: str) -> str:
+    """读取字符串类型的环境变量"""
+    return os.getenv(name, default)
+
+
+@functools.cache
+def _get_int(name: str, default: int) -> int:
+    """读取整数类型的环境变量"""
+    return int(_get_str(name, str(default)))
+
+
+@functools.cache
+def _get_float(name: str, default: float) -> float:
+    """读取浮点数类型的环境变量"""
+    return float(_get_str(name, str(default)))
+
+
+@functools.cache
+def _get_bool(name: str, default: bool) -> bool:
+    """读取布尔类型的环境变量（仅"true"视为真）"""
+    return _get_str(name, "true" if default else "false").lower() == "true"
+
+
 @dataclass
 class DatabaseConfig:
     """数据库配置"""
@@ -17,10 +43,17 @@ class DatabaseConfig:
     user: str
     password: str
     database: str
-    min_size: int = 5
+    # 连接日志由单个后台任务批量写入，常驻少量连接即可
+    min_size: int = 2
     max_size: int = 20
     max_inactive_connection_lifetime: float = 300.0
     timeout: float = 10.0
+    command_timeout: float = 10.0  # 单条SQL执行超时(秒)，避免慢查询长期占用连接
+    # asyncpg按连接缓存预处理语句（prepared statement），热点SQL只解析/规划一次
+    statement_cache_size: int = 100
+    # 统计类短查询不需要JIT编译，关闭可省去每次查询的JIT开销（需要PostgreSQL 11+）
+    disable_jit: bool = True
+    application_name: str = "k8s-web-terminal"
 
 
 @dataclass
@@ -34,6 +67,11 @@ class K8sConfig:
     max_size: int = 10 * 1024 * 1024
     skip_utf8_validation: bool = True
     close_timeout: int = 30
+    max_workers: int = 16  # K8s阻塞调用（exec连接、Pod查询）专用线程数
+    upload_workers: int = 4  # 文件上传专用线程数，上传占用线程直到传输结束
+    # 证书持久化目录，为空时使用kubeconfig同目录下的certs；
+    # 可设为/dev/shm下的目录，证书保存在内存文件系统中，不落盘
+    cert_dir: str = ""
 
 
 @dataclass
@@ -45,6 +83,12 @@ class WebSocketConfig:
     ping_interval: int = 30
     ping_timeout: int = 60
     timeout_keep_alive: int = 300
+    # 终端流量以按键等小数据包为主，压缩只增加CPU开销，默认关闭
+    per_message_deflate: bool = False
+    # 单个进程内同时存在的终端会话（Pod读取线程）上限，0表示不限制
+    max_sessions: int = 0
+    # 向Pod写入（stdin、resize、心跳）的线程数，写入耗时很短，超出时排队即可
+    writer_workers: int = 16
 
 
 @dataclass
@@ -56,6 +100,8 @@ class ServerConfig:
     limit_concurrency: int = 50
     limit_max_requests: int = 5000
     workers: int = 4
+    template_auto_reload: bool = False  # 开发时可开启，修改模板后无需重启
+    loop: str = "auto"  # 事件循环实现，auto在安装了uvloop时自动使用uvloop
 
 
 @dataclass
@@ -69,6 +115,12 @@ class LogConfig:
     log_level: str = "INFO"
     log_format: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     date_format: str = "%Y-%m-%d %H:%M:%S"
+    buffer_capacity: int = 512  # 文件日志内存缓冲条数，ERROR及以上立即写入
+    flush_interval: float = 2.0  # 文件日志定时刷新间隔(秒)
+    # 远程日志收集端地址，设置后日志通过网络发送给收集端，不再在本进程写文件
+    remote_host: str = ""
+    remote_port: int = 9020
+    remote_protocol: str = "udp"  # udp使用DatagramHandler，tcp使用SocketHandler
 
 
 @dataclass
@@ -101,75 +153,89 @@ class AppConfig:
     cors: CorsConfig
 
     @classmethod
+    @functools.cache
     def from_env(cls) -> "AppConfig":
-        """从环境变量加载配置"""
+        """从环境变量加载配置（结果会被缓存）"""
         # 数据库配置
         database = DatabaseConfig(
-            host=os.getenv("POSTGRES_HOST", "10.200.1.171"),
-            port=int(os.getenv("POSTGRES_PORT", "5432")),
-            user=os.getenv("POSTGRES_USER", "kube"),
-            password=os.getenv("POSTGRES_PASSWORD", "kube"),
-            database=os.getenv("POSTGRES_DB", "kube"),
-            min_size=int(os.getenv("DB_MIN_SIZE", "5")),
-            max_size=int(os.getenv("DB_MAX_SIZE", "20")),
-            max_inactive_connection_lifetime=float(
-                os.getenv("DB_MAX_INACTIVE_TIME", "300.0")
-            ),
-            timeout=float(os.getenv("DB_TIMEOUT", "10.0")),
+            host=_get_str("POSTGRES_HOST", "10.200.1.171"),
+            port=_get_int("POSTGRES_PORT", 5432),
+            user=_get_str("POSTGRES_USER", "kube"),
+            password=_get_str("POSTGRES_PASSWORD", "kube"),
+            database=_get_str("POSTGRES_DB", "kube"),
+            min_size=_get_int("DB_MIN_SIZE", 2),
+            max_size=_get_int("DB_MAX_SIZE", 20),
+            max_inactive_connection_lifetime=_get_float("DB_MAX_INACTIVE_TIME", 300.0),
+            timeout=_get_float("DB_TIMEOUT", 10.0),
+            command_timeout=_get_float("DB_COMMAND_TIMEOUT", 10.0),
+            statement_cache_size=_get_int("DB_STATEMENT_CACHE_SIZE", 100),
+            disable_jit=_get_bool("DB_DISABLE_JIT", True),
+            application_name=_get_str("DB_APPLICATION_NAME", "k8s-web-terminal"),
         )
 
         # Kubernetes配置
         config_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config")
         k8s = K8sConfig(
             config_file=os.path.join(config_dir, "config"),
-            verify_ssl=os.getenv("K8S_VERIFY_SSL", "false").lower() == "true",
-            ping_interval=int(os.getenv("K8S_PING_INTERVAL", "30")),
-            ping_timeout=int(os.getenv("K8S_PING_TIMEOUT", "120")),
-            max_size=int(os.getenv("K8S_MAX_SIZE", str(10 * 1024 * 1024))),
-            skip_utf8_validation=os.getenv("K8S_SKIP_UTF8_VALIDATION", "true").lower()
-            == "true",
-            close_timeout=int(os.getenv("K8S_CLOSE_TIMEOUT", "30")),
+            verify_ssl=_get_bool("K8S_VERIFY_SSL", False),
+            ping_interval=_get_int("K8S_PING_INTERVAL", 30),
+            ping_timeout=_get_int("K8S_PING_TIMEOUT", 120),
+            max_size=_get_int("K8S_MAX_SIZE", 10 * 1024 * 1024),
+            skip_utf8_validation=_get_bool("K8S_SKIP_UTF8_VALIDATION", True),
+            close_timeout=_get_int("K8S_CLOSE_TIMEOUT", 30),
+            max_workers=_get_int("K8S_MAX_WORKERS", 16),
+            upload_workers=_get_int("K8S_UPLOAD_WORKERS", 4),
+            cert_dir=_get_str("K8S_CERT_DIR", ""),
         )
 
         # WebSocket配置
         websocket = WebSocketConfig(
-            idle_timeout=int(os.getenv("WS_IDLE_TIMEOUT", "300")),
-            connection_timeout=int(os.getenv("WS_CONNECTION_TIMEOUT", "3600")),
-            ping_interval=int(os.getenv("WS_PING_INTERVAL", "30")),
-            ping_timeout=int(os.getenv("WS_PING_TIMEOUT", "60")),
-            timeout_keep_alive=int(os.getenv("WS_TIMEOUT_KEEP_ALIVE", "300")),
+            idle_timeout=_get_int("WS_IDLE_TIMEOUT", 300),
+            connection_timeout=_get_int("WS_CONNECTION_TIMEOUT", 3600),
+            ping_interval=_get_int("WS_PING_INTERVAL", 30),
+            ping_timeout=_get_int("WS_PING_TIMEOUT", 60),
+            timeout_keep_alive=_get_int("WS_TIMEOUT_KEEP_ALIVE", 300),
+            per_message_deflate=_get_bool("WS_PER_MESSAGE_DEFLATE", False),
+            max_sessions=_get_int("WS_MAX_SESSIONS", 0),
+            writer_workers=_get_int("WS_WRITER_WORKERS", 16),
         )
 
         # 服务器配置
         server = ServerConfig(
-            host=os.getenv("SERVER_HOST", "0.0.0.0"),
-            port=int(os.getenv("SERVER_PORT", "8006")),
-            limit_concurrency=int(os.getenv("SERVER_LIMIT_CONCURRENCY", "50")),
-            limit_max_requests=int(os.getenv("SERVER_LIMIT_MAX_REQUESTS", "5000")),
-            workers=int(os.getenv("SERVER_WORKERS", "4")),
+            host=_get_str("SERVER_HOST", "0.0.0.0"),
+            port=_get_int("SERVER_PORT", 8006),
+            limit_concurrency=_get_int("SERVER_LIMIT_CONCURRENCY", 50),
+            limit_max_requests=_get_int("SERVER_LIMIT_MAX_REQUESTS", 5000),
+            workers=_get_int("SERVER_WORKERS", 4),
+            template_auto_reload=_get_bool("TEMPLATE_AUTO_RELOAD", False),
+            loop=_get_str("SERVER_LOOP", "auto"),
         )
 
         # 日志配置
         log = LogConfig(
-            log_dir=os.getenv("LOG_DIR", "logs"),
-            log_file=os.getenv("LOG_FILE", "terminal.log"),
-            max_bytes=int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024))),
-            backup_count=int(os.getenv("LOG_BACKUP_COUNT", "5")),
-            log_level=os.getenv("LOG_LEVEL", "INFO"),
-            log_format=os.getenv(
+            log_dir=_get_str("LOG_DIR", "logs"),
+            log_file=_get_str("LOG_FILE", "terminal.log"),
+            max_bytes=_get_int("LOG_MAX_BYTES", 10 * 1024 * 1024),
+            backup_count=_get_int("LOG_BACKUP_COUNT", 5),
+            log_level=_get_str("LOG_LEVEL", "INFO"),
+            log_format=_get_str(
                 "LOG_FORMAT", "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
             ),
-            date_format=os.getenv("LOG_DATE_FORMAT", "%Y-%m-%d %H:%M:%S"),
+            date_format=_get_str("LOG_DATE_FORMAT", "%Y-%m-%d %H:%M:%S"),
+            buffer_capacity=_get_int("LOG_BUFFER_CAPACITY", 512),
+            flush_interval=_get_float("LOG_FLUSH_INTERVAL", 2.0),
+            remote_host=_get_str("LOG_REMOTE_HOST", ""),
+            remote_port=_get_int("LOG_REMOTE_PORT", 9020),
+            remote_protocol=_get_str("LOG_REMOTE_PROTOCOL", "udp").lower(),
         )
 
         # CORS配置
-        cors_origins = os.getenv("CORS_ORIGINS")
+        cors_origins = _get_str("CORS_ORIGINS", "")
         cors = CorsConfig(
             allow_origins=cors_origins.split(",") if cors_origins else ["*"],
-            allow_credentials=os.getenv("CORS_ALLOW_CREDENTIALS", "true").lower()
-            == "true",
-            allow_methods=os.getenv("CORS_ALLOW_METHODS", "*").split(","),
-            allow_headers=os.getenv("CORS_ALLOW_HEADERS", "*").split(","),
+            allow_credentials=_get_bool("CORS_ALLOW_CREDENTIALS", True),
+            allow_methods=_get_str("CORS_ALLOW_METHODS", "*").split(","),
+            allow_headers=_get_str("CORS_ALLOW_HEADERS", "*").split(","),
         )
 
         return cls(
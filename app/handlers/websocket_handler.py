@@ -4,9 +4,21 @@ WebSocket处理器模块
 """
 
 import asyncio
-import json
+import logging
+import re
+import selectors
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime
+import orjson
 from fastapi import WebSocket, WebSocketDisconnect
+from kubernetes.stream.ws_client import (
+    RESIZE_CHANNEL,
+    STDERR_CHANNEL,
+    STDOUT_CHANNEL,
+)
+from websocket import ABNF
 from starlette.websockets import WebSocketState
 from ..config import config
 from ..models import K8sConnectionInfo, ConnectionStatus, WebSocketMessage
@@ -18,17 +30,72 @@ from ..utils.exceptions import (
     K8sConnectionError,
     PodConnectionError,
 )
-from ..utils.logger import ws_logger, log_async_function_call
+from ..utils.logger import ws_logger
+
+# WebSocket状态常量，避免在热路径中重复进行枚举属性查找
+_WS_CONNECTED = WebSocketState.CONNECTED
+_WS_DISCONNECTED = WebSocketState.DISCONNECTED
+
+# 未跟随在\r之后的换行符
+_BARE_LF_RE = re.compile(rb"(?<!\r)\n")
+
+# 需要转发到终端的Pod输出通道
+_OUTPUT_CHANNELS = (STDOUT_CHANNEL, STDERR_CHANNEL)
+
+# 浏览器发送的控制消息（如resize）的最大长度
+_MAX_CONTROL_MESSAGE_LEN = 128
+
+# 合并发送到浏览器的单个WebSocket帧的最大字节数
+_MAX_COALESCE_BYTES = 64 * 1024
+
+# 关闭连接时等待Pod读取线程退出的最长时间(秒)
+_READER_JOIN_TIMEOUT = 2.0
+
+
+def _set_future_done(future: asyncio.Future) -> None:
+    """在事件循环中标记Future完成"""
+    if not future.done():
+        future.set_result(None)
 
 
 class WebSocketHandler:
     """WebSocket处理器类"""
 
+    __slots__ = (
+        "k8s_service",
+        "db_service",
+        "_idle_timeout",
+        "_connection_timeout",
+        "_writer_executor",
+        "_max_sessions",
+        "_live_readers",
+        "_readers_lock",
+    )
+
     def __init__(self, k8s_service: KubernetesService, db_service: DatabaseService):
         self.k8s_service = k8s_service
         self.db_service = db_service
+        # 预先读取超时配置，避免每次建立连接时重复查找
+        self._idle_timeout = config.websocket.idle_timeout
+        self._connection_timeout = config.websocket.connection_timeout
+        # 向Pod写入（stdin、resize、心跳）同样是阻塞的socket发送，发送缓冲区满时
+        # 会阻塞；放到独立线程池中执行，避免大段粘贴阻塞其他连接的事件循环处理。
+        # 每个连接的写入依次await，顺序不变；websocket-client的发送自带锁
+        self._writer_executor = ThreadPoolExecutor(
+            max_workers=config.websocket.writer_workers,
+            thread_name_prefix="pod-writer",
+        )
+        # 每个终端会话使用独立的Pod读取线程，不经过线程池排队，不会出现已连接却
+        # 没有输出的情况；按实际存活的读取线程计数，超时未退出的线程仍计入上限
+        self._max_sessions = config.websocket.max_sessions
+        self._live_readers = 0
+        self._readers_lock = threading.Lock()
+
+    def close(self) -> None:
+        """关闭Pod写入线程池"""
+        self._writer_executor.shutdown(wait=False, cancel_futures=True)
+        ws_logger.info("Pod写入线程池已关闭")
 
-    @log_async_function_call(ws_logger)
     async def handle_connection(
         self,
         websocket: WebSocket,
@@ -36,16 +103,40 @@ class WebSocketHandler:
         podname: str,
         chinesename: str = None,
     ) -> None:
-        """处理WebSocket连接的主要逻辑"""
+        """处理WebSocket连接：检查会话数上限后进入终端会话"""
         await websocket.accept()
 
+        if self._max_sessions and self._live_readers >= self._max_sessions:
+            ws_logger.warning(
+                "终端会话数已达上限 %d，拒绝连接: namespace=%s, podname=%s",
+                self._max_sessions,
+                namespace,
+                podname,
+            )
+            try:
+                await websocket.send_text("错误：终端连接数已达上限，请稍后重试\r\n")
+            finally:
+                # 1013: Try Again Later
+                await websocket.close(code=1013)
+            return
+
+        await self._serve_connection(websocket, namespace, podname, chinesename)
+
+    async def _serve_connection(
+        self,
+        websocket: WebSocket,
+        namespace: str,
+        podname: str,
+        chinesename: str = None,
+    ) -> None:
+        """处理WebSocket连接的主要逻辑"""
         effective_username = chinesename if chinesename else "unknown_user"
         ws_logger.info(
             f"为命名空间 {namespace} 中的 {podname} (用户: {effective_username}) 建立了 WebSocket 连接"
         )
 
-        # 记录连接建立日志
-        await self.db_service.log_terminal_connection(
+        # 记录连接建立日志（后台写入）
+        self.db_service.enqueue_terminal_connection(
             effective_username, namespace, podname, "连接建立"
         )
 
@@ -57,20 +148,18 @@ class WebSocketHandler:
                 return
 
             # 创建Pod连接
-            connection_info = K8sConnectionInfo(
-                namespace=namespace, podname=podname, command=["/bin/bash"]
-            )
+            connection_info = K8sConnectionInfo(namespace=namespace, podname=podname)
 
             resp = await self.k8s_service.create_exec_stream(connection_info)
 
             # 创建连接状态 - 修复：直接使用asyncio时间戳
-            current_time = asyncio.get_event_loop().time()
+            current_time = asyncio.get_running_loop().time()
             connection_status = ConnectionStatus(
                 is_active=True,
                 last_activity_time=current_time,
                 connection_start_time=current_time,
-                idle_timeout=config.websocket.idle_timeout,
-                connection_timeout=config.websocket.connection_timeout,
+                idle_timeout=self._idle_timeout,
+                connection_timeout=self._connection_timeout,
             )
 
             # 启动读写任务
@@ -83,7 +172,7 @@ class WebSocketHandler:
         except Exception as e:
             error_msg = f"WebSocket 错误，针对 {podname}：{e}\r\n"
             ws_logger.error(error_msg)
-            if websocket.client_state != WebSocketState.DISCONNECTED:
+            if websocket.client_state != _WS_DISCONNECTED:
                 try:
                     await websocket.send_text(error_msg)
                 except Exception:
@@ -93,18 +182,17 @@ class WebSocketHandler:
             ws_logger.info(
                 f"WebSocket 连接已关闭，对应 Pod：{podname}，所在命名空间：{namespace}"
             )
-            # 记录连接关闭日志
-            try:
-                await self.db_service.log_terminal_connection(
-                    effective_username, namespace, podname, "连接关闭"
-                )
-            except Exception as log_err:
-                ws_logger.error(f"记录连接关闭日志时出错: {log_err}")
+            # 记录连接关闭日志（后台写入）
+            self.db_service.enqueue_terminal_connection(
+                effective_username, namespace, podname, "连接关闭"
+            )
 
     async def _handle_communication(
         self, websocket: WebSocket, resp, connection_status: ConnectionStatus
     ) -> None:
         """处理WebSocket和Pod之间的通信"""
+        loop = asyncio.get_running_loop()
+
         # 创建读写任务
         read_task = asyncio.create_task(
             self._read_from_pod(websocket, resp, connection_status)
@@ -113,6 +201,13 @@ class WebSocketHandler:
             self._write_to_pod(websocket, resp, connection_status)
         )
 
+        # 心跳和超时检查使用定时器，仅在到期时唤醒，不再在读循环中轮询
+        timers = {}
+        self._schedule_heartbeat(loop, resp, connection_status, timers)
+        self._schedule_timeout_check(
+            loop, connection_status, (read_task, write_task), timers
+        )
+
         try:
             # 等待任一任务完成或超时
             done, pending = await asyncio.wait(
@@ -121,107 +216,141 @@ class WebSocketHandler:
                 timeout=connection_status.connection_timeout,
             )
 
-            # 取消未完成的任务
+            if not done:
+                ws_logger.warning("WebSocket连接超时，强制关闭")
+
+            # 取消未完成的任务，并一次性等待它们结束
             for task in pending:
                 task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
-                except Exception as cancel_err:
-                    ws_logger.error(f"取消任务时出错: {cancel_err}")
+            results = await asyncio.gather(*pending, return_exceptions=True)
+            for result in results:
+                # CancelledError属于BaseException，不会在此被记录
+                if isinstance(result, Exception):
+                    ws_logger.error(f"取消任务时出错: {result}")
+        finally:
+            for timer in timers.values():
+                timer.cancel()
+            # 读写任务均已结束，统一清理一次流资源
+            await self._cleanup_pod_stream(resp, websocket, "handle_communication")
 
-        except asyncio.TimeoutError:
-            ws_logger.warning("WebSocket连接超时，强制关闭")
-            read_task.cancel()
-            write_task.cancel()
-            try:
-                await read_task
-                await write_task
-            except (asyncio.CancelledError, Exception):
-                pass
+    def _schedule_heartbeat(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        resp,
+        connection_status: ConnectionStatus,
+        timers: dict,
+    ) -> None:
+        """安排下一次Kubernetes连接心跳"""
+        timers["heartbeat"] = loop.call_later(
+            15, self._on_heartbeat_timer, loop, resp, connection_status, timers
+        )
+
+    def _on_heartbeat_timer(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        resp,
+        connection_status: ConnectionStatus,
+        timers: dict,
+    ) -> None:
+        """心跳定时器回调：发送心跳并重新安排"""
+        if not connection_status.is_active or not connection_status.pod_open:
+            return
+        loop.run_in_executor(self._writer_executor, self._send_heartbeat, resp)
+        self._schedule_heartbeat(loop, resp, connection_status, timers)
+
+    def _schedule_timeout_check(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        connection_status: ConnectionStatus,
+        tasks: tuple,
+        timers: dict,
+    ) -> None:
+        """按最近的空闲/总时长截止时间安排超时检查"""
+        deadline = min(
+            connection_status.last_activity_time + connection_status.idle_timeout,
+            connection_status.connection_start_time
+            + connection_status.connection_timeout,
+        )
+        timers["timeout"] = loop.call_later(
+            max(deadline - loop.time(), 1.0),
+            self._on_timeout_timer,
+            loop,
+            connection_status,
+            tasks,
+            timers,
+        )
+
+    def _on_timeout_timer(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        connection_status: ConnectionStatus,
+        tasks: tuple,
+        timers: dict,
+    ) -> None:
+        """超时定时器回调：有新的活动则顺延，否则结束读写任务"""
+        if not connection_status.is_active:
+            return
+        if self._check_connection_timeout(connection_status, loop.time()):
+            self._schedule_timeout_check(loop, connection_status, tasks, timers)
+            return
+        connection_status.is_active = False
+        for task in tasks:
+            task.cancel()
 
     async def _read_from_pod(
         self, websocket: WebSocket, resp, connection_status: ConnectionStatus
     ) -> None:
-        """从Pod读取数据并发送到WebSocket"""
+        """从Pod读取数据并发送到WebSocket
+
+        阻塞的Pod读取在独立线程中执行，读取到的数据通过有界队列
+        交给当前协程批量发送，空闲时不再周期性唤醒事件循环
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=64)  # 有界队列，提供背压
+        stop_event = threading.Event()
+        pending_chunks = []
+        reader_future = None
         try:
-            timeout = 0.1  # 100毫秒的超时，减少上下文切换
-            last_heartbeat_time = asyncio.get_event_loop().time()
-            last_check_time = asyncio.get_event_loop().time()
-            message_buffer = []
-            last_buffer_flush = asyncio.get_event_loop().time()
-            buffer_flush_interval = 0.016  # 约60fps，16ms
-            max_buffer_size = 8192  # 缓冲区最大大小，增加传输效率
             compression_threshold = 1024  # 数据压缩阈值
+            debug_enabled = ws_logger.isEnabledFor(logging.DEBUG)
+            reader_done = False
+
+            reader_future = self._start_reader(
+                resp, loop, queue, stop_event, connection_status
+            )
 
-            while resp.is_open() and connection_status.is_active:
+            while not reader_done and connection_status.is_active:
                 try:
-                    resp.update(timeout=timeout)
-                    data_received = False
-
-                    # 处理标准输出
-                    if resp.peek_stdout():
-                        stdout_data = resp.read_stdout()
-                        if stdout_data:
-                            stdout_data = self._format_terminal_data(stdout_data)
-                            if websocket.client_state == WebSocketState.CONNECTED:
-                                message_buffer.append(stdout_data.encode())
-                                data_received = True
-                            else:
-                                break
-
-                    # 处理标准错误
-                    if resp.peek_stderr():
-                        stderr_data = resp.read_stderr()
-                        if stderr_data:
-                            stderr_data = self._format_terminal_data(stderr_data)
-                            if websocket.client_state == WebSocketState.CONNECTED:
-                                message_buffer.append(stderr_data.encode())
-                                data_received = True
-                            else:
-                                break
-
-                    # 检查是否需要刷新缓冲区
-                    current_time = asyncio.get_event_loop().time()
-                    should_flush = (
-                        len(message_buffer) >= 10  # 消息数量阈值
-                        or sum(len(d) for d in message_buffer)
-                        >= max_buffer_size  # 总大小阈值
-                        or current_time - last_buffer_flush
-                        >= buffer_flush_interval  # 时间间隔
-                    )
-
-                    if (should_flush and message_buffer) or not resp.is_open():
-                        combined_data = b"".join(message_buffer)
-                        
+                    chunk = await queue.get()
+
+                    # 取出队列中已就绪的数据，合并为一次发送；单次合并不超过
+                    # _MAX_COALESCE_BYTES，避免大量输出时单帧过大、首屏延迟增加
+                    pending_size = 0
+                    while chunk is not None:
+                        pending_chunks.append(chunk)
+                        pending_size += len(chunk)
+                        if pending_size >= _MAX_COALESCE_BYTES:
+                            break
+                        try:
+                            chunk = queue.get_nowait()
+                        except asyncio.QueueEmpty:
+                            break
+                    if chunk is None:
+                        reader_done = True
+
+                    if pending_chunks:
+                        if websocket.client_state != _WS_CONNECTED:
+                            break
+                        combined_data = b"".join(pending_chunks)
+                        pending_chunks = []
+
                         # 大数据压缩优化（可选功能）
-                        if len(combined_data) > compression_threshold:
+                        if len(combined_data) > compression_threshold and debug_enabled:
                             # 对于大数据，可以考虑压缩，但会增加CPU开销
                             # 这里暂时直接发送，后续可以根据实际需求启用压缩
                             ws_logger.debug(f"发送大数据包: {len(combined_data)} 字节")
-                        
-                        await websocket.send_bytes(combined_data)
-                        message_buffer = []
-                        last_buffer_flush = current_time
-
-                    # 定期检查连接状态
-                    if current_time - last_check_time > 30:
-                        last_check_time = current_time
-                        if not self._check_connection_timeout(
-                            connection_status, current_time
-                        ):
-                            connection_status.is_active = False
-                            break
-
-                    # 发送心跳
-                    if current_time - last_heartbeat_time > 15:
-                        await self._send_heartbeat(resp)
-                        last_heartbeat_time = current_time
 
-                    # 动态调整休眠时间
-                    sleep_time = 0.01 if data_received else 0.05
-                    await asyncio.sleep(sleep_time)
+                        await websocket.send_bytes(combined_data)
 
                 except Exception as loop_err:
                     ws_logger.error(f"Pod读取循环中出错: {loop_err}")
@@ -231,64 +360,198 @@ class WebSocketHandler:
 
         except Exception as e:
             ws_logger.error(f"从 Pod 读取时出错: {e}")
-            if websocket.client_state == WebSocketState.CONNECTED:
+            if websocket.client_state == _WS_CONNECTED:
                 try:
                     await websocket.send_text(f"从 Pod 读取时出错: {e}\r\n")
                 except Exception:
                     pass
         finally:
+            # 通知读取线程退出，并等待其结束，确保关闭Pod流时不再有线程读取同一socket；
+            # 读取线程的socket等待和队列写入均以1秒为周期检查停止标记
+            stop_event.set()
+            if reader_future is not None:
+                await self._join_reader(reader_future)
+
+            # 取出队列剩余数据
+            while True:
+                try:
+                    chunk = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if chunk:
+                    pending_chunks.append(chunk)
+
             # 清理时发送剩余缓冲区数据
-            if message_buffer and websocket.client_state == WebSocketState.CONNECTED:
+            if pending_chunks and websocket.client_state == _WS_CONNECTED:
                 try:
-                    combined_data = b"".join(message_buffer)
+                    combined_data = b"".join(pending_chunks)
                     await websocket.send_bytes(combined_data)
                 except Exception as e:
                     ws_logger.error(f"清理缓冲区时发送数据失败: {e}")
-            await self._cleanup_pod_stream(resp, websocket, "read_from_pod")
+
+    def _start_reader(
+        self,
+        resp,
+        loop: asyncio.AbstractEventLoop,
+        queue: asyncio.Queue,
+        stop_event: threading.Event,
+        connection_status: ConnectionStatus,
+    ) -> asyncio.Future:
+        """启动会话的Pod读取线程，返回在线程退出时完成的Future"""
+        reader_future = loop.create_future()
+        with self._readers_lock:
+            self._live_readers += 1
+        thread = threading.Thread(
+            target=self._run_reader,
+            args=(resp, loop, queue, stop_event, connection_status, reader_future),
+            name="pod-reader",
+            daemon=True,
+        )
+        try:
+            thread.start()
+        except BaseException:
+            with self._readers_lock:
+                self._live_readers -= 1
+            raise
+        return reader_future
+
+    def _run_reader(
+        self,
+        resp,
+        loop: asyncio.AbstractEventLoop,
+        queue: asyncio.Queue,
+        stop_event: threading.Event,
+        connection_status: ConnectionStatus,
+        reader_future: asyncio.Future,
+    ) -> None:
+        """读取线程入口：线程真正退出时才释放会话计数"""
+        try:
+            self._pump_pod_output(resp, loop, queue, stop_event, connection_status)
+        finally:
+            with self._readers_lock:
+                self._live_readers -= 1
+            try:
+                loop.call_soon_threadsafe(_set_future_done, reader_future)
+            except RuntimeError:
+                # 事件循环已关闭
+                pass
+
+    async def _join_reader(self, reader_future: asyncio.Future) -> None:
+        """等待Pod读取线程退出，超时则放弃等待"""
+        done, _ = await asyncio.wait({reader_future}, timeout=_READER_JOIN_TIMEOUT)
+        if not done:
+            ws_logger.warning("Pod读取线程未在超时时间内退出")
+
+    def _pump_pod_output(
+        self,
+        resp,
+        loop: asyncio.AbstractEventLoop,
+        queue: asyncio.Queue,
+        stop_event: threading.Event,
+        connection_status: ConnectionStatus,
+    ) -> None:
+        """在读取线程中阻塞等待Pod输出，并将数据放入事件循环的队列
+
+        直接在底层socket上等待并逐帧读取，不再经过WSClient.update()
+        和peek_*()，避免每帧多次select，并能读取到已缓存在TLS层的数据。
+        由于不再调用update()，resp.is_open()不会反映Pod端的关闭，
+        读取结束时通过connection_status.pod_open通知写入方
+        """
+        timeout = 1.0  # 仅用于定期检查停止标记，有数据时立即返回
+        # select.select无法处理编号不小于1024的文件描述符，使用selectors（Linux上为epoll）
+        selector = selectors.DefaultSelector()
+        try:
+            ws = resp.sock
+            raw_sock = ws.sock
+            selector.register(raw_sock, selectors.EVENT_READ)
+            # TLS层可能已缓存完整的帧，此时socket本身不会变为可读
+            pending = getattr(raw_sock, "pending", None)
+            while not stop_event.is_set() and ws.connected:
+                if not (pending and pending()):
+                    if not selector.select(timeout):
+                        continue
+
+                op_code, frame = ws.recv_data_frame(True)
+                if op_code == ABNF.OPCODE_CLOSE:
+                    return
+                if op_code not in (ABNF.OPCODE_TEXT, ABNF.OPCODE_BINARY):
+                    continue
+
+                # 帧格式：首字节为通道号，其后为数据；直接转发字节，不再解码后
+                # 重新编码，跨帧截断的多字节字符由浏览器端按UTF-8流式解码
+                data = frame.data
+                if len(data) < 2 or data[0] not in _OUTPUT_CHANNELS:
+                    continue
+
+                chunk = self._format_terminal_data(data[1:])
+                if not self._put_threadsafe(loop, queue, chunk, stop_event):
+                    return
+        except Exception as e:
+            if not stop_event.is_set():
+                ws_logger.error(f"Pod读取线程出错: {e}")
+        finally:
+            # 关闭帧、EOF或读取出错后Pod流都不能再写入
+            connection_status.pod_open = False
+            selector.close()
+            # 放入结束标记，通知发送协程读取已结束
+            if not stop_event.is_set():
+                self._put_threadsafe(loop, queue, None, stop_event)
+
+    def _put_threadsafe(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        queue: asyncio.Queue,
+        item,
+        stop_event: threading.Event,
+    ) -> bool:
+        """从读取线程向队列放入数据，队列满时阻塞等待，连接结束时返回False"""
+        try:
+            future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        except RuntimeError:
+            # 事件循环已关闭
+            return False
+        while True:
+            try:
+                future.result(timeout=1.0)
+                return True
+            except FutureTimeoutError:
+                if stop_event.is_set():
+                    future.cancel()
+                    return False
+            except Exception:
+                return False
 
     async def _write_to_pod(
         self, websocket: WebSocket, resp, connection_status: ConnectionStatus
     ) -> None:
         """从WebSocket读取数据并发送到Pod"""
+        now = asyncio.get_running_loop().time
+        debug_enabled = ws_logger.isEnabledFor(logging.DEBUG)
         try:
             while connection_status.is_active:
                 try:
-                    # 设置超时
-                    data = await asyncio.wait_for(websocket.receive_text(), timeout=30)
+                    # 直接等待消息，不再为每条消息创建超时定时器：空闲/总时长超时由
+                    # 超时定时器处理，Pod连接关闭时读取任务结束并取消本任务，
+                    # 客户端失联由WebSocket ping检测
+                    data = await websocket.receive_text()
 
                     # 检查心跳包
                     if data == "\x00":
-                        ws_logger.debug("收到心跳包，跳过处理")
+                        if debug_enabled:
+                            ws_logger.debug("收到心跳包，跳过处理")
                         continue
 
-                    # 更新活动时间 - 修复：直接使用asyncio时间戳
-                    connection_status.last_activity_time = (
-                        asyncio.get_event_loop().time()
-                    )
+                    # 更新活动时间，空闲/总时长超时由超时定时器按截止时间检查，
+                    # 不再在每条消息后重复计算
+                    connection_status.last_activity_time = now()
 
-                    if not resp.is_open():
+                    if not connection_status.pod_open:
                         ws_logger.warning("Pod连接已关闭，无法写入数据")
                         break
 
                     # 处理消息
                     await self._process_websocket_message(data, resp)
 
-                    # 检查超时
-                    if not self._check_connection_timeout(connection_status):
-                        break
-
-                except asyncio.TimeoutError:
-                    # 超时检查
-                    if not self._check_connection_timeout(connection_status):
-                        break
-                    if (
-                        not resp.is_open()
-                        or websocket.client_state != WebSocketState.CONNECTED
-                    ):
-                        ws_logger.info("检测到连接已关闭，终止写入循环")
-                        break
-                    continue
-
                 except WebSocketDisconnect:
                     ws_logger.info("WebSocket 被客户端断开连接")
                     break
@@ -301,19 +564,24 @@ class WebSocketHandler:
 
         except Exception as outer_e:
             ws_logger.error(f"写入 Pod 的外层循环出错: {outer_e}")
-        finally:
-            await self._cleanup_pod_stream(resp, websocket, "write_to_pod")
 
     async def _process_websocket_message(self, data: str, resp) -> None:
         """处理WebSocket消息"""
-        try:
-            # 尝试解析为JSON消息
-            message = json.loads(data)
-            if isinstance(message, dict) and message.get("type") == "resize":
-                await self._handle_resize_message(message, resp)
-                return
-        except json.JSONDecodeError:
-            pass
+        # 只有形如resize控制消息的短JSON对象才尝试解析，普通按键直接跳过；
+        # 限制长度，避免用户粘贴大段JSON文本时被完整解析一次
+        if (
+            len(data) <= _MAX_CONTROL_MESSAGE_LEN
+            and data[0:1] == "{"
+            and data[-1] == "}"
+            and '"resize"' in data
+        ):
+            try:
+                message = orjson.loads(data)
+                if isinstance(message, dict) and message.get("type") == "resize":
+                    await self._handle_resize_message(message, resp)
+                    return
+            except orjson.JSONDecodeError:
+                pass
 
         # 处理普通文本消息
         await self._handle_text_message(data, resp)
@@ -324,39 +592,38 @@ class WebSocketHandler:
         rows = message.get("rows")
 
         if cols is not None and rows is not None:
-            resize_payload = json.dumps({"Width": int(cols), "Height": int(rows)})
+            # orjson直接生成bytes，write_channel以二进制帧发送，无需再解码为str
+            resize_payload = orjson.dumps({"Width": int(cols), "Height": int(rows)})
             if resp.is_open():
-                from kubernetes.stream import ws_client
-
-                resp.write_channel(ws_client.RESIZE_CHANNEL, resize_payload)
+                await asyncio.get_running_loop().run_in_executor(
+                    self._writer_executor,
+                    resp.write_channel,
+                    RESIZE_CHANNEL,
+                    resize_payload,
+                )
                 ws_logger.info(f"已发送 PTY resize 请求: cols={cols}, rows={rows}")
             else:
                 ws_logger.warning("Pod 连接已关闭，无法发送 PTY resize 请求")
 
     async def _handle_text_message(self, data: str, resp) -> None:
         """处理文本消息"""
-        if len(data) > 100 or "\n" in data:
-            # 处理长文本或多行文本
-            lines = data.splitlines()
-            for i, line in enumerate(lines):
-                if resp.is_open():
-                    resp.write_stdin(line)
-                    if i < len(lines) - 1:
-                        resp.write_stdin("\n")
-                else:
-                    ws_logger.warning("Pod 连接已关闭，无法写入粘贴数据")
-                    break
-        else:
-            # 处理单行文本
-            if resp.is_open():
-                resp.write_stdin(data)
-            else:
-                ws_logger.warning("Pod 连接已关闭，无法写入单行数据")
+        if not resp.is_open():
+            ws_logger.warning("Pod 连接已关闭，无法写入数据")
+            return
 
-    def _format_terminal_data(self, data: str) -> str:
-        """格式化终端数据"""
-        if not data.endswith("\r\n") and data.endswith("\n"):
-            return data.replace("\n", "\r\n")
+        # 按原样一次性写入（包括多行粘贴文本），换行符由Pod端的终端处理
+        await asyncio.get_running_loop().run_in_executor(
+            self._writer_executor, resp.write_stdin, data
+        )
+
+    def _format_terminal_data(self, data: bytes) -> bytes:
+        """格式化终端数据：以裸换行结尾时，仅将裸\\n转换为\\r\\n"""
+        # TTY输出通常已是\r\n结尾，两次endswith即可判断无需转换
+        if data.endswith(b"\n") and not data.endswith(b"\r\n"):
+            # 只有末尾一个换行时（如逐行输出）直接替换结尾，不再运行正则
+            if data.find(b"\n") == len(data) - 1:
+                return data[:-1] + b"\r\n"
+            return _BARE_LF_RE.sub(b"\r\n", data)
         return data
 
     def _check_connection_timeout(
@@ -364,7 +631,7 @@ class WebSocketHandler:
     ) -> bool:
         """检查连接是否超时 - 修复：直接比较浮点数时间戳"""
         if current_time is None:
-            current_time = asyncio.get_event_loop().time()
+            current_time = asyncio.get_running_loop().time()
 
         # 检查空闲超时 - 直接比较浮点数
         if (
@@ -384,7 +651,7 @@ class WebSocketHandler:
 
         return True
 
-    async def _send_heartbeat(self, resp) -> None:
+    def _send_heartbeat(self, resp) -> None:
         """发送Kubernetes连接心跳"""
         try:
             if resp.is_open():
@@ -406,12 +673,15 @@ class WebSocketHandler:
 
         if resp.is_open():
             try:
-                resp.close()
+                # 关闭会等待WebSocket关闭握手，属于阻塞调用，放到写入线程池中执行
+                await asyncio.get_running_loop().run_in_executor(
+                    self._writer_executor, resp.close
+                )
                 ws_logger.info(f"Pod响应流已关闭 ({source})")
             except Exception as resp_close_err:
                 ws_logger.error(f"关闭Pod响应流时出错: {resp_close_err}")
 
-        if websocket.client_state != WebSocketState.DISCONNECTED:
+        if websocket.client_state != _WS_DISCONNECTED:
             try:
                 await websocket.close()
                 ws_logger.info(f"WebSocket连接已关闭 ({source})")
@@ -3,10 +3,14 @@
 定义应用中使用的所有数据模型
 """
 
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel, Field
 
+# 终端默认执行的命令；使用不可变元组，所有连接共用同一个对象
+DEFAULT_EXEC_COMMAND = ("/bin/bash",)
+
 
 class DatabaseConfig(BaseModel):
     """数据库配置模型"""
@@ -39,13 +43,14 @@ class FileUploadResponse(BaseModel):
     status_code: Optional[int] = None
 
 
-class WebSocketMessage(BaseModel):
-    """WebSocket消息模型"""
+@dataclass(slots=True)
+class WebSocketMessage:
+    """WebSocket消息模型（内部使用，不做校验）"""
 
-    type: str = Field(..., description="消息类型")
-    cols: Optional[int] = Field(None, description="终端列数")
-    rows: Optional[int] = Field(None, description="终端行数")
-    data: Optional[str] = Field(None, description="消息数据")
+    type: str  # 消息类型
+    cols: Optional[int] = None  # 终端列数
+    rows: Optional[int] = None  # 终端行数
+    data: Optional[str] = None  # 消息数据
 
 
 class HealthCheckResponse(BaseModel):
@@ -67,21 +72,22 @@ class APIResponse(BaseModel):
     error_code: Optional[str] = Field(None, description="错误代码")
 
 
-class K8sConnectionInfo(BaseModel):
-    """Kubernetes连接信息模型"""
+@dataclass(slots=True)
+class K8sConnectionInfo:
+    """Kubernetes连接信息模型（内部使用，不做校验）"""
 
-    namespace: str = Field(..., description="命名空间")
-    podname: str = Field(..., description="Pod名称")
-    command: list[str] = Field(
-        default_factory=lambda: ["/bin/bash"], description="执行命令"
-    )
+    namespace: str  # 命名空间
+    podname: str  # Pod名称
+    command: tuple[str, ...] = DEFAULT_EXEC_COMMAND  # 执行命令
 
 
-class ConnectionStatus(BaseModel):
-    """连接状态模型 - 修复：使用浮点数时间戳而不是datetime对象"""
+@dataclass(slots=True)
+class ConnectionStatus:
+    """连接状态模型 - 使用浮点数时间戳，每次输入都会更新，使用slots减少开销"""
 
-    is_active: bool = Field(..., description="连接是否活跃")
-    last_activity_time: float = Field(..., description="最后活动时间(时间戳)")
-    connection_start_time: float = Field(..., description="连接开始时间(时间戳)")
-    idle_timeout: int = Field(default=300, description="空闲超时时间")
-    connection_timeout: int = Field(default=3600, description="连接超时时间")
+    is_active: bool  # 连接是否活跃
+    last_activity_time: float  # 最后活动时间(时间戳)
+    connection_start_time: float  # 连接开始时间(时间戳)
+    idle_timeout: int = 300  # 空闲超时时间
+    connection_timeout: int = 3600  # 连接超时时间
+    pod_open: bool = True  # Pod流是否仍然打开，读取线程收到关闭帧或EOF时置为False
@@ -3,25 +3,108 @@
 管理数据库连接池和数据库操作
 """
 
+import asyncio
+import time
 import asyncpg
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 from ..config import config
 from ..models import TerminalLog
 from ..utils.exceptions import DatabaseConnectionError, DatabaseOperationError
 from ..utils.logger import db_logger, log_async_function_call
 
+# 批量写入使用COPY二进制协议，整批一次往返，服务端无需逐行解析和规划
+_TERMINAL_LOG_COPY_COLUMNS = (
+    "username",
+    "namespace",
+    "podname",
+    "connection_time",
+    "action",
+)
+
+# COPY整批失败时逐行写入使用的语句
+_INSERT_TERMINAL_LOG_SQL = (
+    "INSERT INTO terminal_logs (username, namespace, podname, connection_time, action) "
+    "VALUES ($1, $2, $3, $4, $5)"
+)
+
+# terminal_logs中文本列的最大长度（VARCHAR(255)）
+_VARCHAR_MAX_LEN = 255
+
+# 后台批量写入终端连接日志的参数
+_LOG_BATCH_SIZE = 100  # 每批最多写入条数
+_LOG_FLUSH_INTERVAL = 0.05  # 最长合并等待时间(秒)
+
+# 建表/建索引时使用的咨询锁键，多个worker进程启动时串行执行DDL
+_SCHEMA_LOCK_KEY = 0x6B387774
+
+_STATS_CACHE_TTL = 15  # 连接统计结果缓存有效期(秒)
+
+# get_terminal_logs的过滤条件位
+_FILTER_USERNAME = 1
+_FILTER_NAMESPACE = 2
+_FILTER_PODNAME = 4
+_FILTER_BEFORE = 8
+
+
+def _build_terminal_logs_query(mask: int) -> str:
+    """根据过滤条件位生成get_terminal_logs的SQL"""
+    conditions = []
+    param_count = 0
+    for flag, column in (
+        (_FILTER_USERNAME, "username"),
+        (_FILTER_NAMESPACE, "namespace"),
+        (_FILTER_PODNAME, "podname"),
+    ):
+        if mask & flag:
+            param_count += 1
+            conditions.append(f"{column} = ${param_count}")
+    if mask & _FILTER_BEFORE:
+        param_count += 2
+        conditions.append(
+            f"(connection_time, id) < (${param_count - 1}, ${param_count})"
+        )
+
+    query = (
+        "SELECT id, username, namespace, podname, connection_time, action "
+        "FROM terminal_logs"
+    )
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    return query + f" ORDER BY connection_time DESC, id DESC LIMIT ${param_count + 1}"
+
+
+# 全部16种过滤组合的SQL在导入时生成，文本固定也便于asyncpg复用预处理语句
+_TERMINAL_LOG_QUERIES = {mask: _build_terminal_logs_query(mask) for mask in range(16)}
+
+
+def _fit_varchar(value) -> str:
+    """转换为可写入VARCHAR(255)列的文本：去掉PostgreSQL不接受的NUL字符并截断"""
+    value = str(value)
+    if "\x00" in value:
+        value = value.replace("\x00", "")
+    return value[:_VARCHAR_MAX_LEN]
+
 
 class DatabaseService:
     """数据库服务类"""
 
     def __init__(self):
         self.pool: Optional[asyncpg.Pool] = None
+        self._open = False  # 连接池是否可用，在initialize/close中切换
+        self._log_queue: Optional[asyncio.Queue] = None  # 待写入的终端连接日志
+        self._log_worker: Optional[asyncio.Task] = None
+        # 连接统计缓存：(过期时间, 结果)；终端连接日志持续写入，仅按有效期失效
+        self._stats_cache: Optional[tuple[float, dict]] = None
 
     @log_async_function_call(db_logger)
     async def initialize(self) -> None:
         """初始化数据库连接池"""
         try:
+            server_settings = {"application_name": config.database.application_name}
+            if config.database.disable_jit:
+                server_settings["jit"] = "off"
+
             self.pool = await asyncpg.create_pool(
                 user=config.database.user,
                 password=config.database.password,
@@ -32,11 +115,19 @@ class DatabaseService:
                 max_size=config.database.max_size,
                 max_inactive_connection_lifetime=config.database.max_inactive_connection_lifetime,
                 timeout=config.database.timeout,
+                command_timeout=config.database.command_timeout,
+                statement_cache_size=config.database.statement_cache_size,
+                server_settings=server_settings,
             )
 
             # 创建表
             await self._create_tables()
 
+            # 启动后台日志写入任务，连接日志不再阻塞WebSocket建立和关闭
+            self._log_queue = asyncio.Queue(maxsize=10000)
+            self._log_worker = asyncio.create_task(self._run_log_worker())
+            self._open = True
+
             db_logger.info("数据库连接池已创建，terminal_logs 表已准备就绪")
 
         except Exception as e:
@@ -46,6 +137,18 @@ class DatabaseService:
     @log_async_function_call(db_logger)
     async def close(self) -> None:
         """关闭数据库连接池"""
+        self._open = False
+        if self._log_worker:
+            # 尽量写完队列中剩余的日志
+            await self.flush()
+            self._log_worker.cancel()
+            try:
+                await self._log_worker
+            except asyncio.CancelledError:
+                pass
+            self._log_worker = None
+            self._log_queue = None
+
         if self.pool:
             await self.pool.close()
             db_logger.info("数据库连接池已关闭")
@@ -56,109 +159,172 @@ class DatabaseService:
             raise DatabaseConnectionError("数据库连接池未初始化")
 
         async with self.pool.acquire() as connection:
-            await connection.execute(
-                """
-                CREATE TABLE IF NOT EXISTS terminal_logs (
-                    id SERIAL PRIMARY KEY,
-                    username VARCHAR(255) NOT NULL,
-                    namespace VARCHAR(255) NOT NULL,
-                    podname VARCHAR(255) NOT NULL,
-                    connection_time TIMESTAMP WITHOUT TIME ZONE DEFAULT (NOW() AT TIME ZONE 'UTC'),
-                    action VARCHAR(255) DEFAULT '连接'
-                );
-            """
+            # INCLUDE覆盖列需要PostgreSQL 11+，更早的版本只建普通的时间索引
+            include = (
+                " INCLUDE (username, namespace, podname, action)"
+                if connection.get_server_version().major >= 11
+                else ""
             )
 
-    @log_async_function_call(db_logger)
-    async def log_terminal_connection(
+            # 多个worker进程同时启动时，用事务级咨询锁串行执行建表/建索引，
+            # 避免并发CREATE INDEX IF NOT EXISTS冲突；对象已存在时各语句均为空操作
+            async with connection.transaction():
+                await connection.execute(
+                    "SELECT pg_advisory_xact_lock($1)", _SCHEMA_LOCK_KEY
+                )
+                await connection.execute(
+                    f"""
+                    CREATE TABLE IF NOT EXISTS terminal_logs (
+                        id SERIAL PRIMARY KEY,
+                        username VARCHAR(255) NOT NULL,
+                        namespace VARCHAR(255) NOT NULL,
+                        podname VARCHAR(255) NOT NULL,
+                        connection_time TIMESTAMP WITHOUT TIME ZONE DEFAULT (NOW() AT TIME ZONE 'UTC'),
+                        action VARCHAR(255) DEFAULT '连接'
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_terminal_logs_time
+                        ON terminal_logs (connection_time DESC, id DESC){include};
+                    CREATE INDEX IF NOT EXISTS idx_terminal_logs_user_time
+                        ON terminal_logs (username, connection_time DESC);
+                    CREATE INDEX IF NOT EXISTS idx_terminal_logs_namespace_time
+                        ON terminal_logs (namespace, connection_time DESC);
+                    CREATE INDEX IF NOT EXISTS idx_terminal_logs_pod_time
+                        ON terminal_logs (podname, connection_time DESC);
+                """
+                )
+
+    def enqueue_terminal_connection(
         self, username: str, namespace: str, podname: str, action: str = "连接"
     ) -> None:
-        """记录终端连接日志"""
-        if not self.pool:
-            db_logger.error("数据库连接池不可用，无法记录日志")
+        """将终端连接日志放入后台队列，由后台任务异步写入数据库"""
+        if self._log_queue is None:
+            db_logger.error("数据库日志队列不可用，无法记录日志")
             return
 
+        # 批量写入会延后落库，因此在入队时记录事件时间，而不是依赖表的默认值；
+        # 列类型为不带时区的UTC时间，去掉tzinfo后再绑定
+        connection_time = datetime.now(timezone.utc).replace(tzinfo=None)
         try:
-            async with self.pool.acquire() as connection:
-                await connection.execute(
-                    "INSERT INTO terminal_logs (username, namespace, podname, connection_time, action) VALUES ($1, $2, $3, $4, $5)",
-                    username,
-                    namespace,
-                    podname,
-                    datetime.utcnow(),
-                    action,
+            self._log_queue.put_nowait(
+                (
+                    _fit_varchar(username),
+                    _fit_varchar(namespace),
+                    _fit_varchar(podname),
+                    connection_time,
+                    _fit_varchar(action),
                 )
+            )
+        except asyncio.QueueFull:
+            db_logger.warning(
+                f"终端连接日志队列已满，丢弃日志: 用户名={username}, 命名空间={namespace}, Pod名称={podname}, 操作={action}"
+            )
 
-                # 立即提交事务
-                await connection.execute("COMMIT")
+    async def flush(self, timeout: float = 5.0) -> None:
+        """等待后台队列中的终端连接日志全部写入数据库"""
+        if self._log_queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._log_queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            db_logger.warning(
+                f"仍有 {self._log_queue.qsize()} 条终端连接日志未写入"
+            )
 
-                db_logger.info(
-                    f"日志记录成功: 用户名={username}, 命名空间={namespace}, Pod名称={podname}, 操作={action}"
-                )
+    async def _run_log_worker(self) -> None:
+        """后台任务：批量写入队列中的终端连接日志
+
+        每批最多写入 _LOG_BATCH_SIZE 条，或最多等待 _LOG_FLUSH_INTERVAL 秒
+        """
+        queue = self._log_queue
+        while True:
+            rows = [await queue.get()]
+            # 队列中数据不足一批时稍作等待，合并突发的连接/断开日志
+            if queue.qsize() < _LOG_BATCH_SIZE - 1:
+                await asyncio.sleep(_LOG_FLUSH_INTERVAL)
+            while len(rows) < _LOG_BATCH_SIZE:
+                try:
+                    rows.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            try:
+                await self._write_terminal_logs(rows)
+            except Exception as e:
+                db_logger.error(f"后台写入 {len(rows)} 条终端连接日志失败: {e}")
+            finally:
+                for _ in rows:
+                    queue.task_done()
+
+    async def _write_terminal_logs(self, rows: list[tuple]) -> None:
+        """使用COPY批量写入终端连接日志"""
+        if not self.pool:
+            db_logger.error("数据库连接池不可用，无法记录日志")
+            return
 
+        # 每行为 (用户名, 命名空间, Pod名称, 时间, 操作)，与列顺序一致
+        try:
+            await self.pool.copy_records_to_table(
+                "terminal_logs", records=rows, columns=_TERMINAL_LOG_COPY_COLUMNS
+            )
         except Exception as e:
-            db_logger.error(f"记录终端连接日志时出错: {e}")
-            raise DatabaseOperationError(f"记录终端连接日志失败: {e}")
+            # COPY整批要么全部成功要么全部失败，改为逐行写入，只丢弃出错的行
+            db_logger.warning(
+                f"批量写入 {len(rows)} 条终端连接日志失败，改为逐行写入: {e}"
+            )
+            written = 0
+            for row in rows:
+                try:
+                    await self.pool.execute(_INSERT_TERMINAL_LOG_SQL, *row)
+                    written += 1
+                except Exception as row_error:
+                    db_logger.error(
+                        f"写入终端连接日志失败，丢弃该条记录 {row}: {row_error}"
+                    )
+            db_logger.info(f"逐行写入终端连接日志 {written}/{len(rows)} 条")
+            return
+
+        db_logger.info(f"批量写入终端连接日志 {len(rows)} 条")
 
     @log_async_function_call(db_logger)
     async def get_terminal_logs(
         self,
         limit: int = 100,
-        offset: int = 0,
+        before: Optional[tuple[datetime, int]] = None,
         username: Optional[str] = None,
         namespace: Optional[str] = None,
         podname: Optional[str] = None,
     ) -> list[TerminalLog]:
-        """获取终端日志"""
+        """获取终端日志（键集分页）
+
+        按 (connection_time, id) 倒序返回；翻页时将上一页最后一条记录的
+        (connection_time, id) 作为 before 传入，避免 OFFSET 扫描并丢弃前面的行
+        """
         if not self.pool:
             raise DatabaseConnectionError("数据库连接池不可用")
 
         try:
-            query = "SELECT * FROM terminal_logs WHERE 1=1"
+            # 按提供的过滤条件选择预先生成的SQL，参数顺序与SQL中的占位符一致
+            mask = 0
             params = []
-            param_count = 0
-
             if username:
-                param_count += 1
-                query += f" AND username = ${param_count}"
+                mask |= _FILTER_USERNAME
                 params.append(username)
-
             if namespace:
-                param_count += 1
-                query += f" AND namespace = ${param_count}"
+                mask |= _FILTER_NAMESPACE
                 params.append(namespace)
-
             if podname:
-                param_count += 1
-                query += f" AND podname = ${param_count}"
+                mask |= _FILTER_PODNAME
                 params.append(podname)
-
-            query += " ORDER BY connection_time DESC"
-
-            param_count += 1
-            query += f" LIMIT ${param_count}"
+            if before:
+                mask |= _FILTER_BEFORE
+                params.extend(before)
             params.append(limit)
+            query = _TERMINAL_LOG_QUERIES[mask]
 
-            param_count += 1
-            query += f" OFFSET ${param_count}"
-            params.append(offset)
-
-            async with self.pool.acquire() as connection:
-                rows = await connection.fetch(query, *params)
-
-                logs = []
-                for row in rows:
-                    log = TerminalLog(
-                        id=row["id"],
-                        username=row["username"],
-                        namespace=row["namespace"],
-                        podname=row["podname"],
-                        connection_time=row["connection_time"],
-                        action=row["action"],
-                    )
-                    logs.append(log)
+            rows = await self.pool.fetch(query, *params)
 
-                return logs
+            # 数据来自数据库且列已固定，跳过pydantic校验直接构造
+            return [TerminalLog.model_construct(**row) for row in rows]
 
         except Exception as e:
             db_logger.error(f"获取终端日志时出错: {e}")
@@ -166,49 +332,57 @@ class DatabaseService:
 
     @log_async_function_call(db_logger)
     async def get_connection_stats(self) -> dict:
-        """获取连接统计信息"""
+        """获取连接统计信息（结果缓存 _STATS_CACHE_TTL 秒）"""
         if not self.pool:
             raise DatabaseConnectionError("数据库连接池不可用")
 
-        try:
-            async with self.pool.acquire() as connection:
-                # 总连接数
-                total_count = await connection.fetchval(
-                    "SELECT COUNT(*) FROM terminal_logs"
-                )
+        now = time.monotonic()
+        if self._stats_cache is not None:
+            expires_at, cached_stats = self._stats_cache
+            if now < expires_at:
+                return cached_stats
 
-                # 今日连接数
-                today_count = await connection.fetchval(
+        try:
+            # 四个查询互不依赖，分别从连接池获取连接并发执行
+            total_count, today_count, active_users, recent_connections = (
+                await asyncio.gather(
+                    # 总连接数
+                    self.pool.fetchval("SELECT COUNT(*) FROM terminal_logs"),
+                    # 今日连接数
+                    self.pool.fetchval(
+                        """
+                        SELECT COUNT(*) FROM terminal_logs 
+                        WHERE connection_time >= CURRENT_DATE
+                          AND connection_time < CURRENT_DATE + INTERVAL '1 day'
                     """
-                    SELECT COUNT(*) FROM terminal_logs 
-                    WHERE DATE(connection_time) = CURRENT_DATE
-                """
-                )
-
-                # 活跃用户数
-                active_users = await connection.fetchval(
+                    ),
+                    # 活跃用户数
+                    self.pool.fetchval(
+                        """
+                        SELECT COUNT(DISTINCT username) FROM terminal_logs 
+                        WHERE connection_time >= NOW() - INTERVAL '24 hours'
                     """
-                    SELECT COUNT(DISTINCT username) FROM terminal_logs 
-                    WHERE connection_time >= NOW() - INTERVAL '24 hours'
-                """
-                )
-
-                # 最近连接
-                recent_connections = await connection.fetch(
+                    ),
+                    # 最近连接
+                    self.pool.fetch(
+                        """
+                        SELECT username, namespace, podname, connection_time, action 
+                        FROM terminal_logs 
+                        ORDER BY connection_time DESC 
+                        LIMIT 10
                     """
-                    SELECT username, namespace, podname, connection_time, action 
-                    FROM terminal_logs 
-                    ORDER BY connection_time DESC 
-                    LIMIT 10
-                """
+                    ),
                 )
+            )
 
-                return {
-                    "total_connections": total_count,
-                    "today_connections": today_count,
-                    "active_users_24h": active_users,
-                    "recent_connections": [dict(row) for row in recent_connections],
-                }
+            stats = {
+                "total_connections": total_count,
+                "today_connections": today_count,
+                "active_users_24h": active_users,
+                "recent_connections": [dict(row) for row in recent_connections],
+            }
+            self._stats_cache = (now + _STATS_CACHE_TTL, stats)
+            return stats
 
         except Exception as e:
             db_logger.error(f"获取连接统计信息时出错: {e}")
@@ -216,7 +390,7 @@ class DatabaseService:
 
     def is_connected(self) -> bool:
         """检查数据库是否连接"""
-        return self.pool is not None and not self.pool._closed
+        return self._open
 
 
 # 全局数据库服务实例
@@ -5,9 +5,16 @@ Kubernetes服务模块
 
 import os
 import time
+import hashlib
 import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import kubernetes
+import yaml
 from kubernetes.client import Configuration as K8sConfiguration
+from kubernetes.client.exceptions import ApiException
+from kubernetes.stream import stream as k8s_stream
 from typing import Optional
 import base64
 import re
@@ -21,6 +28,31 @@ from ..utils.exceptions import (
 )
 from ..utils.logger import k8s_logger, log_async_function_call, log_function_call
 
+# 判断证书文件错误时沿异常链查找的最大层数
+_CERT_ERROR_MAX_DEPTH = 4
+
+# 证书临时文件的打开方式：Windows下需要O_BINARY，否则以文本模式写入
+_CERT_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+# macOS/Windows没有fdatasync，退回fsync
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+# 优先使用libyaml实现的C解析器
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# kubeconfig中的证书字段 -> (Configuration属性名, 持久化文件名, 日志用名称)
+_CERT_FILES = (
+    ("certificate-authority-data", "ssl_ca_cert", "ca.crt", "CA证书"),
+    ("client-certificate-data", "cert_file", "client.crt", "客户端证书"),
+    ("client-key-data", "key_file", "client.key", "客户端私钥"),
+)
+
+# YAML解析失败时使用的行级正则（适用于单集群/单用户结构）
+_KUBECONFIG_KEY_RE = re.compile(
+    r"^[ \t-]*(certificate-authority-data|client-certificate-data|client-key-data|server):"
+    r"[ \t]*(.+?)\s*$",
+    re.MULTILINE,
+)
+
 
 class KubernetesService:
     """Kubernetes服务类"""
@@ -28,8 +60,36 @@ class KubernetesService:
     def __init__(self):
         self.api_client: Optional[kubernetes.client.ApiClient] = None
         self.core_v1: Optional[kubernetes.client.CoreV1Api] = None
-        self._pod_cache = {}  # Pod信息缓存
+        # K8s阻塞调用专用线程池，避免与进程内其他run_in_executor调用争用默认线程池
+        self._k8s_executor: Optional[ThreadPoolExecutor] = None
+        # 重新初始化在线程池中执行，多个请求同时遇到证书错误时串行处理
+        self._reinit_lock = threading.Lock()
+        # Pod存在性缓存（LRU，有上限）：{(namespace, podname): (是否存在, 缓存时的单调时钟)}
+        self._pod_cache: OrderedDict[tuple[str, str], tuple[bool, float]] = (
+            OrderedDict()
+        )
+        self._pod_cache_maxsize = 4096
+        self._pod_cache_lock = threading.Lock()
         self._cache_ttl = 300  # 缓存有效期5分钟
+        self._negative_cache_ttl = 2  # 不存在结果的缓存有效期，避免掩盖新创建的Pod
+        # 正在进行中的Pod存在性查询：{(namespace, podname): Task}
+        self._pod_checks_inflight: dict[tuple[str, str], asyncio.Task] = {}
+        # Pod信息缓存：{(namespace, podname): (信息字典，不存在时为None, 缓存时的单调时钟)}
+        # 状态等字段会变化，有效期较短；与存在性缓存共用上限和锁
+        self._pod_info_cache: OrderedDict[
+            tuple[str, str], tuple[Optional[dict], float]
+        ] = OrderedDict()
+        self._pod_info_ttl = 30
+        self._pod_info_inflight: dict[tuple[str, str], asyncio.Task] = {}
+        # 缓存命中/未命中计数，便于观察缓存效果
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # kubeconfig内容缓存：(文件mtime_ns, 文本, 解析出的键值)，文件未修改时不再重复读取
+        self._kubeconfig_cache: Optional[tuple[int, str, dict]] = None
+        # 持久化证书路径缓存：(kubeconfig的mtime_ns, 证书路径字典)
+        self._cert_paths_cache: Optional[tuple[int, dict]] = None
+        # 已写入证书文件的内容摘要：{文件路径: blake2b摘要}
+        self._cert_digests: dict[str, bytes] = {}
 
     @log_function_call(k8s_logger)
     def initialize(self) -> None:
@@ -43,20 +103,18 @@ class KubernetesService:
             # 1) 优先确保证书持久化，避免临时文件被系统清理
             cert_paths = self._ensure_persistent_cert_files()
 
-            # 2) 尝试常规方式加载Kube配置
+            # 2) 尝试常规方式加载Kube配置；直接加载到本服务独占的配置对象中，
+            #    不再修改kubernetes全局默认配置，重新初始化时也不会影响其他线程
+            k8s_client_config = K8sConfiguration()
             try:
-                kubernetes.config.load_kube_config(config_file=config.k8s.config_file)
+                kubernetes.config.load_kube_config(
+                    config_file=config.k8s.config_file,
+                    client_configuration=k8s_client_config,
+                )
             except Exception as e:
                 # 如果常规加载失败（通常是临时证书文件问题），记录并继续使用手动配置
                 k8s_logger.warning(f"常规load_kube_config失败，尝试手动配置: {e}")
 
-            # 获取配置并自定义
-            try:
-                k8s_client_config = K8sConfiguration.get_default_copy()
-            except Exception:
-                # 如果默认配置不可用，创建一个新的配置实例
-                k8s_client_config = K8sConfiguration()
-
             # 基本SSL行为
             k8s_client_config.verify_ssl = config.k8s.verify_ssl
 
@@ -83,10 +141,18 @@ class KubernetesService:
                 "close_timeout": config.k8s.close_timeout,
             }
 
-            self.api_client = kubernetes.client.ApiClient(
-                configuration=k8s_client_config
-            )
-            self.core_v1 = kubernetes.client.CoreV1Api(api_client=self.api_client)
+            # 新客户端先在局部变量中构建完成再替换，重新初始化期间其他协程和线程
+            # 始终能拿到一个可用的客户端
+            api_client = kubernetes.client.ApiClient(configuration=k8s_client_config)
+            core_v1 = kubernetes.client.CoreV1Api(api_client=api_client)
+            self.api_client = api_client
+            self.core_v1 = core_v1
+
+            # 重新初始化时沿用已有线程池
+            if self._k8s_executor is None:
+                self._k8s_executor = ThreadPoolExecutor(
+                    max_workers=config.k8s.max_workers, thread_name_prefix="k8s"
+                )
 
             k8s_logger.info("Kubernetes配置已成功加载和自定义（使用持久化证书文件）")
 
@@ -94,6 +160,60 @@ class KubernetesService:
             k8s_logger.error(f"Kubernetes初始化失败: {e}")
             raise K8sConnectionError(f"Kubernetes初始化失败: {e}")
 
+    def _read_kubeconfig(self) -> tuple[int, str, dict]:
+        """读取kubeconfig文本并解析证书/server字段，按文件mtime缓存
+
+        返回 (mtime_ns, 文本, {键: 值})
+        """
+        mtime_ns = os.stat(config.k8s.config_file).st_mtime_ns
+        cached = self._kubeconfig_cache
+        if cached is not None and cached[0] == mtime_ns:
+            return cached
+
+        with open(config.k8s.config_file, "r", encoding="utf-8") as f:
+            config_text = f.read()
+
+        try:
+            values = self._parse_kubeconfig_yaml(config_text)
+        except Exception as e:
+            # 文件格式异常时退回行级正则解析
+            k8s_logger.warning(f"按YAML解析kubeconfig失败，改用行级解析: {e}")
+            values = {}
+            # 一次扫描取出全部字段，同名字段以第一次出现为准
+            for m in _KUBECONFIG_KEY_RE.finditer(config_text):
+                # 去除可能的引号
+                values.setdefault(m.group(1), m.group(2).strip("\"'"))
+
+        self._kubeconfig_cache = (mtime_ns, config_text, values)
+        return self._kubeconfig_cache
+
+    @staticmethod
+    def _parse_kubeconfig_yaml(config_text: str) -> dict:
+        """按YAML解析kubeconfig，取current-context对应集群和用户的证书/server字段"""
+        doc = yaml.load(config_text, Loader=_YamlLoader)
+
+        def find(section: str, name: Optional[str]) -> dict:
+            entries = doc.get(section) or []
+            for entry in entries:
+                if name is None or entry.get("name") == name:
+                    return entry.get(section[:-1]) or {}
+            return {}
+
+        context = find("contexts", doc.get("current-context"))
+        cluster = find("clusters", context.get("cluster"))
+        user = find("users", context.get("user"))
+
+        values = {}
+        for key, source in (
+            ("certificate-authority-data", cluster),
+            ("server", cluster),
+            ("client-certificate-data", user),
+            ("client-key-data", user),
+        ):
+            if source.get(key):
+                values[key] = str(source[key]).strip()
+        return values
+
     @log_function_call(k8s_logger)
     def _ensure_persistent_cert_files(self) -> dict:
         """确保证书数据持久化到稳定路径，避免/tmp临时文件被清理
@@ -101,92 +221,115 @@ class KubernetesService:
         """
         cert_paths: dict = {}
         try:
-            config_text = ""
-            with open(config.k8s.config_file, "r", encoding="utf-8") as f:
-                config_text = f.read()
-
-            def extract_value(key: str) -> Optional[str]:
-                # 简单的YAML行级解析，适用于当前单集群/单用户结构
-                m = re.search(rf"{key}:\s*(.+)", config_text)
-                if not m:
-                    return None
-                val = m.group(1).strip()
-                # 去除可能的引号
-                return val.strip('"').strip("'")
-
-            ca_data_b64 = extract_value("certificate-authority-data")
-            client_cert_b64 = extract_value("client-certificate-data")
-            client_key_b64 = extract_value("client-key-data")
-
-            cert_dir = os.path.join(os.path.dirname(config.k8s.config_file), "certs")
+            mtime_ns, _, values = self._read_kubeconfig()
+
+            # kubeconfig未修改且证书文件仍在时，直接复用上次的结果
+            cached = self._cert_paths_cache
+            if (
+                cached is not None
+                and cached[0] == mtime_ns
+                and all(os.path.exists(path) for path in cached[1].values())
+            ):
+                return dict(cached[1])
+
+            cert_dir = config.k8s.cert_dir or os.path.join(
+                os.path.dirname(config.k8s.config_file), "certs"
+            )
             os.makedirs(cert_dir, exist_ok=True)
 
-            if ca_data_b64 and not ca_data_b64.startswith("/"):
+            for kube_key, path_key, filename, label in _CERT_FILES:
+                data_b64 = values.get(kube_key)
+                if not data_b64 or data_b64.startswith("/"):
+                    continue
                 try:
-                    ca_bytes = base64.b64decode(ca_data_b64)
-                    ca_path = os.path.join(cert_dir, "ca.crt")
-                    with open(ca_path, "wb") as f:
-                        f.write(ca_bytes)
-                    cert_paths["ssl_ca_cert"] = ca_path
+                    path = os.path.join(cert_dir, filename)
+                    self._write_cert_file(path, data_b64)
+                    cert_paths[path_key] = path
                 except Exception as e:
-                    k8s_logger.warning(f"写入CA证书失败，将继续尝试使用默认行为: {e}")
+                    k8s_logger.warning(f"写入{label}失败，继续默认行为: {e}")
 
-            if client_cert_b64 and not client_cert_b64.startswith("/"):
-                try:
-                    crt_bytes = base64.b64decode(client_cert_b64)
-                    crt_path = os.path.join(cert_dir, "client.crt")
-                    with open(crt_path, "wb") as f:
-                        f.write(crt_bytes)
-                    cert_paths["cert_file"] = crt_path
-                except Exception as e:
-                    k8s_logger.warning(f"写入客户端证书失败，继续默认行为: {e}")
-
-            if client_key_b64 and not client_key_b64.startswith("/"):
-                try:
-                    key_bytes = base64.b64decode(client_key_b64)
-                    key_path = os.path.join(cert_dir, "client.key")
-                    with open(key_path, "wb") as f:
-                        f.write(key_bytes)
-                    cert_paths["key_file"] = key_path
-                except Exception as e:
-                    k8s_logger.warning(f"写入客户端私钥失败，继续默认行为: {e}")
+            self._cert_paths_cache = (mtime_ns, dict(cert_paths))
         except Exception as e:
             k8s_logger.warning(f"读取或解析Kubernetes配置证书数据失败: {e}")
         return cert_paths
 
+    def _write_cert_file(self, path: str, data_b64: str) -> None:
+        """解码并写入证书文件；内容与上次写入的相同且文件仍在时跳过
+
+        先写同目录临时文件（权限0600）并落盘，再os.replace，
+        避免并发初始化读到写了一半的证书
+        """
+        digest = hashlib.blake2b(data_b64.encode(), digest_size=16).digest()
+        if self._cert_digests.get(path) == digest and os.path.exists(path):
+            return
+
+        data = memoryview(base64.b64decode(data_b64))
+        tmp_path = path + ".tmp"
+        fd = os.open(tmp_path, _CERT_OPEN_FLAGS, 0o600)
+        try:
+            try:
+                while data:
+                    data = data[os.write(fd, data) :]
+                _fdatasync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, path)
+        except BaseException:
+            # 写入失败时不留下半成品临时文件
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._cert_digests[path] = digest
+
     def _extract_value_from_kubeconfig(self, key: str) -> Optional[str]:
         """从kubeconfig文本中提取简单的键值（行级），用于server等字段"""
         try:
-            with open(config.k8s.config_file, "r", encoding="utf-8") as f:
-                text = f.read()
-            m = re.search(rf"{key}:\s*(.+)", text)
-            if m:
-                return m.group(1).strip().strip('"').strip("'")
+            return self._read_kubeconfig()[2].get(key)
         except Exception:
             pass
         return None
 
     @log_function_call(k8s_logger)
-    def reinitialize(self) -> None:
+    def reinitialize(
+        self, stale_client: Optional[kubernetes.client.ApiClient] = None
+    ) -> None:
         """重新初始化Kubernetes客户端
 
-        当SSL证书临时文件被清理导致连接失败时，调用此方法重新初始化连接
+        当SSL证书临时文件被清理导致连接失败时，调用此方法重新初始化连接。
+        stale_client为调用方出错时使用的客户端；若它已被其他调用方替换，则不再重复重建
         """
-        k8s_logger.info("正在重新初始化Kubernetes客户端...")
+        with self._reinit_lock:
+            old_client = self.api_client
+            if stale_client is not None and old_client is not stale_client:
+                k8s_logger.info("Kubernetes客户端已由其他请求重新初始化，跳过")
+                return
 
-        # 先关闭现有连接
-        if self.api_client:
-            try:
-                self.api_client.close()
-            except Exception as e:
-                k8s_logger.warning(f"关闭旧连接时出错: {e}")
+            k8s_logger.info("正在重新初始化Kubernetes客户端...")
+
+            # 构建并替换为新客户端（证书持久化在initialize中完成），失败时保留旧客户端
+            self.initialize()
+
+            # 替换完成后再关闭旧连接；正在使用旧客户端的请求会在完成后释放连接
+            if old_client is not None and old_client is not self.api_client:
+                try:
+                    old_client.close()
+                except Exception as e:
+                    k8s_logger.warning(f"关闭旧连接时出错: {e}")
+            k8s_logger.info("Kubernetes客户端已成功重新初始化")
+
+    async def run_blocking(self, func, *args):
+        """在K8s专用线程池中执行阻塞调用（Kubernetes客户端请求、文件读写等）"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._k8s_executor, func, *args
+        )
 
-        # 重新初始化前也确保证书持久化，避免再次出现/tmp临时文件问题
-        self._ensure_persistent_cert_files()
-        self.api_client = None
-        self.core_v1 = None
-        self.initialize()
-        k8s_logger.info("Kubernetes客户端已成功重新初始化")
+    async def reinitialize_async(
+        self, stale_client: Optional[kubernetes.client.ApiClient] = None
+    ) -> None:
+        """在线程池中重新初始化Kubernetes客户端，读取kubeconfig和写证书文件不阻塞事件循环"""
+        await self.run_blocking(self.reinitialize, stale_client)
 
     @log_function_call(k8s_logger)
     def close(self) -> None:
@@ -194,56 +337,80 @@ class KubernetesService:
         if self.api_client:
             self.api_client.close()
             k8s_logger.info("Kubernetes API客户端已关闭")
+        if self._k8s_executor:
+            self._k8s_executor.shutdown(wait=False, cancel_futures=True)
+            self._k8s_executor = None
 
-    @log_function_call(k8s_logger)
-    def check_pod_exists(self, namespace: str, podname: str) -> bool:
-        """检查Pod是否存在（带缓存）"""
+    @log_async_function_call(k8s_logger)
+    async def check_pod_exists(self, namespace: str, podname: str) -> bool:
+        """检查Pod是否存在（带缓存，未命中时在线程池中请求API，不阻塞事件循环）"""
         if not self.core_v1:
             raise K8sConnectionError("Kubernetes客户端未初始化")
 
         # 检查缓存
-        cache_key = f"{namespace}:{podname}"
-        current_time = time.time()
-
-        if cache_key in self._pod_cache:
-            cached_result, cache_time = self._pod_cache[cache_key]
-            if current_time - cache_time < self._cache_ttl:
-                k8s_logger.debug(f"Pod存在性检查命中缓存: {namespace}/{podname}")
-                return cached_result
-
+        cache_key = (namespace, podname)
+        current_time = time.monotonic()
+
+        cached_result = self._get_cached_pod_exists(cache_key, current_time)
+        if cached_result is not None:
+            k8s_logger.debug("Pod存在性检查命中缓存: %s/%s", namespace, podname)
+            return cached_result
+
+        # 同一Pod的并发检查合并为一次API请求，其余调用等待同一结果；
+        # 使用shield避免某个调用方被取消时连带取消共享的查询任务
+        task = self._pod_checks_inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._fetch_pod_exists(namespace, podname, cache_key, current_time)
+            )
+            self._pod_checks_inflight[cache_key] = task
+            task.add_done_callback(
+                lambda _: self._pod_checks_inflight.pop(cache_key, None)
+            )
+        return await asyncio.shield(task)
+
+    async def _fetch_pod_exists(
+        self,
+        namespace: str,
+        podname: str,
+        cache_key: tuple[str, str],
+        current_time: float,
+    ) -> bool:
+        """请求API检查Pod是否存在并写入缓存"""
         # 最多尝试2次（初始尝试 + 1次重试）
         max_retries = 1
         retry_count = 0
 
         while True:
+            core_v1 = self.core_v1
             try:
-                self.core_v1.read_namespaced_pod(name=podname, namespace=namespace)
+                await asyncio.get_running_loop().run_in_executor(
+                    self._k8s_executor,
+                    core_v1.read_namespaced_pod,
+                    podname,
+                    namespace,
+                )
                 # 缓存结果
-                self._pod_cache[cache_key] = (True, current_time)
+                self._cache_pod_exists(cache_key, True, current_time)
                 return True
-            except kubernetes.client.exceptions.ApiException as e:
+            except ApiException as e:
                 if e.status == 404:
                     # 缓存结果
-                    self._pod_cache[cache_key] = (False, current_time)
+                    self._cache_pod_exists(cache_key, False, current_time)
                     return False
                 else:
                     k8s_logger.error(f"检查Pod存在性时出错: {e}")
                     raise K8sConnectionError(f"检查Pod时出错: {e}")
             except Exception as e:
-                # 检查是否为SSL错误
-                error_str = str(e)
-                if (
-                    "SSLError" in error_str
-                    and "FileNotFoundError" in error_str
-                    and retry_count < max_retries
-                ):
+                # 检查是否为SSL证书文件丢失导致的错误
+                if self.is_cert_file_error(e) and retry_count < max_retries:
                     k8s_logger.warning(
                         f"检测到SSL证书文件错误，尝试重新初始化连接: {e}"
                     )
                     retry_count += 1
                     try:
-                        # 重新初始化连接
-                        self.reinitialize()
+                        # 重新初始化连接（阻塞的文件读写在线程池中执行）
+                        await self.reinitialize_async(core_v1.api_client)
                         # 继续循环，重新尝试
                         continue
                     except Exception as reinit_error:
@@ -256,55 +423,131 @@ class KubernetesService:
                     k8s_logger.error(f"检查Pod存在性时发生未处理错误: {e}")
                     raise K8sConnectionError(f"检查Pod时发生未处理错误: {e}")
 
-    @log_function_call(k8s_logger)
-    def get_pod_info(self, namespace: str, podname: str) -> dict:
-        """获取Pod信息"""
+    def _get_cached_pod_exists(
+        self, cache_key: tuple[str, str], current_time: float
+    ):
+        """读取未过期的Pod存在性缓存，未命中返回None"""
+        with self._pod_cache_lock:
+            entry = self._pod_cache.get(cache_key)
+            if entry is None:
+                self.cache_misses += 1
+                return None
+            cached_result, cache_time = entry
+            ttl = self._cache_ttl if cached_result else self._negative_cache_ttl
+            if current_time - cache_time >= ttl:
+                del self._pod_cache[cache_key]
+                self.cache_misses += 1
+                return None
+            self._pod_cache.move_to_end(cache_key)
+            self.cache_hits += 1
+            return cached_result
+
+    def _cache_pod_exists(
+        self, cache_key: tuple[str, str], exists: bool, current_time: float
+    ):
+        """写入Pod存在性缓存，超出上限时淘汰最久未使用的条目"""
+        with self._pod_cache_lock:
+            self._pod_cache[cache_key] = (exists, current_time)
+            self._pod_cache.move_to_end(cache_key)
+            if len(self._pod_cache) > self._pod_cache_maxsize:
+                self._pod_cache.popitem(last=False)
+
+    @log_async_function_call(k8s_logger)
+    async def get_pod_info(self, namespace: str, podname: str) -> dict:
+        """获取Pod信息（缓存 _pod_info_ttl 秒，并发请求同一Pod时只查询一次）"""
         if not self.core_v1:
             raise K8sConnectionError("Kubernetes客户端未初始化")
 
+        cache_key = (namespace, podname)
+        with self._pod_cache_lock:
+            entry = self._pod_info_cache.get(cache_key)
+            if entry is not None:
+                info, cache_time = entry
+                ttl = self._pod_info_ttl if info else self._negative_cache_ttl
+                if time.monotonic() - cache_time < ttl:
+                    self._pod_info_cache.move_to_end(cache_key)
+                    if info is None:
+                        raise PodNotFoundError(podname, namespace)
+                    return dict(info)
+                del self._pod_info_cache[cache_key]
+
+        task = self._pod_info_inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._fetch_pod_info(namespace, podname, cache_key)
+            )
+            self._pod_info_inflight[cache_key] = task
+            task.add_done_callback(
+                lambda _: self._pod_info_inflight.pop(cache_key, None)
+            )
+        return dict(await asyncio.shield(task))
+
+    async def _fetch_pod_info(
+        self, namespace: str, podname: str, cache_key: tuple[str, str]
+    ) -> dict:
+        """请求API获取Pod信息并写入缓存"""
         try:
-            pod = self.core_v1.read_namespaced_pod(name=podname, namespace=namespace)
-            return {
-                "name": pod.metadata.name,
-                "namespace": pod.metadata.namespace,
-                "status": pod.status.phase,
-                "node": pod.spec.node_name,
-                "creation_time": pod.metadata.creation_timestamp,
-                "labels": pod.metadata.labels or {},
-                "containers": [container.name for container in pod.spec.containers],
-            }
-        except kubernetes.client.exceptions.ApiException as e:
+            pod = await asyncio.get_running_loop().run_in_executor(
+                self._k8s_executor,
+                self.core_v1.read_namespaced_pod,
+                podname,
+                namespace,
+            )
+        except ApiException as e:
             if e.status == 404:
+                self._cache_pod_info(cache_key, None)
                 raise PodNotFoundError(podname, namespace)
             else:
                 k8s_logger.error(f"获取Pod信息时出错: {e}")
                 raise K8sConnectionError(f"获取Pod信息时出错: {e}")
 
+        info = {
+            "name": pod.metadata.name,
+            "namespace": pod.metadata.namespace,
+            "status": pod.status.phase,
+            "node": pod.spec.node_name,
+            "creation_time": pod.metadata.creation_timestamp,
+            "labels": pod.metadata.labels or {},
+            "containers": [container.name for container in pod.spec.containers],
+        }
+        self._cache_pod_info(cache_key, info)
+        return info
+
+    def _cache_pod_info(self, cache_key: tuple[str, str], info: Optional[dict]):
+        """写入Pod信息缓存，同时更新存在性缓存"""
+        current_time = time.monotonic()
+        with self._pod_cache_lock:
+            self._pod_info_cache[cache_key] = (info, current_time)
+            self._pod_info_cache.move_to_end(cache_key)
+            if len(self._pod_info_cache) > self._pod_cache_maxsize:
+                self._pod_info_cache.popitem(last=False)
+        self._cache_pod_exists(cache_key, info is not None, current_time)
+
     @log_async_function_call(k8s_logger)
     async def create_exec_stream(self, connection_info: K8sConnectionInfo):
         """创建Pod执行流"""
         if not self.core_v1:
             raise K8sConnectionError("Kubernetes客户端未初始化")
 
+        cache_key = (connection_info.namespace, connection_info.podname)
+
+        # 只利用缓存快速失败：近期确认不存在的Pod无需再发起exec请求，
+        # 存在的Pod不做额外确认
+        if self._get_cached_pod_exists(cache_key, time.monotonic()) is False:
+            raise PodNotFoundError(connection_info.podname, connection_info.namespace)
+
         # 最多尝试2次（初始尝试 + 1次重试）
         max_retries = 1
         retry_count = 0
 
         while True:
+            core_v1 = self.core_v1
             try:
-                # 首先检查Pod是否存在
-                if not self.check_pod_exists(
-                    connection_info.namespace, connection_info.podname
-                ):
-                    raise PodNotFoundError(
-                        connection_info.podname, connection_info.namespace
-                    )
-
-                # 创建执行流 - 使用正确的stream函数
-                resp = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: kubernetes.stream.stream(
-                        self.core_v1.connect_get_namespaced_pod_exec,
+                # 直接创建执行流 - 不再预先检查Pod是否存在，Pod不存在时由404错误识别
+                resp = await asyncio.get_running_loop().run_in_executor(
+                    self._k8s_executor,
+                    lambda: k8s_stream(
+                        core_v1.connect_get_namespaced_pod_exec,
                         connection_info.podname,
                         connection_info.namespace,
                         command=connection_info.command,
@@ -319,25 +562,25 @@ class KubernetesService:
                 k8s_logger.info(
                     f"成功创建到Pod {connection_info.podname} 的执行流，命名空间：{connection_info.namespace}"
                 )
+                self._cache_pod_exists(cache_key, True, time.monotonic())
                 return resp
 
-            except PodNotFoundError:
-                raise
             except Exception as e:
-                # 检查是否为SSL错误
-                error_str = str(e)
-                if (
-                    "SSLError" in error_str
-                    and "FileNotFoundError" in error_str
-                    and retry_count < max_retries
-                ):
+                if isinstance(e, ApiException) and self._is_not_found_error(e):
+                    self._cache_pod_exists(cache_key, False, time.monotonic())
+                    raise PodNotFoundError(
+                        connection_info.podname, connection_info.namespace
+                    )
+
+                # 检查是否为SSL证书文件丢失导致的错误
+                if self.is_cert_file_error(e) and retry_count < max_retries:
                     k8s_logger.warning(
                         f"创建执行流时检测到SSL证书文件错误，尝试重新初始化连接: {e}"
                     )
                     retry_count += 1
                     try:
-                        # 重新初始化连接
-                        self.reinitialize()
+                        # 重新初始化连接（阻塞的文件读写在线程池中执行）
+                        await self.reinitialize_async(core_v1.api_client)
                         # 继续循环，重新尝试
                         continue
                     except Exception as reinit_error:
@@ -354,6 +597,39 @@ class KubernetesService:
                         f"创建Pod执行流失败: {e}",
                     )
 
+    @staticmethod
+    def is_cert_file_error(error: BaseException) -> bool:
+        """判断错误是否由SSL证书文件丢失引起（需要重新持久化证书并重建客户端）
+
+        沿异常链（__cause__/__context__、urllib3的reason、包装的参数）
+        查找FileNotFoundError，不再对str(e)做子串匹配
+        """
+        pending = [error]
+        for _ in range(_CERT_ERROR_MAX_DEPTH):
+            nested = []
+            for exc in pending:
+                if isinstance(exc, FileNotFoundError):
+                    return True
+                nested.append(exc.__cause__)
+                nested.append(exc.__context__)
+                nested.append(getattr(exc, "reason", None))
+                nested.extend(exc.args)
+            pending = [exc for exc in nested if isinstance(exc, BaseException)]
+            if not pending:
+                break
+        return False
+
+    @staticmethod
+    def _is_not_found_error(error: ApiException) -> bool:
+        """判断exec调用的错误是否表示Pod不存在
+
+        WebSocket握手失败时kubernetes客户端会包装成status=0的ApiException，
+        原始的HTTP状态码只出现在reason里
+        """
+        if error.status == 404:
+            return True
+        return error.status == 0 and "Handshake status 404" in str(error.reason)
+
     def is_connected(self) -> bool:
         """检查Kubernetes是否连接"""
         return self.api_client is not None and self.core_v1 is not None
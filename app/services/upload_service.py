@@ -4,16 +4,17 @@
 """
 
 import os
-import shutil
-import tempfile
-import io
+import time
+import asyncio
 import tarfile
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import UploadFile
 import kubernetes
-from kubernetes.client import Configuration as K8sConfiguration
-from kubernetes.stream import ws_client
+from kubernetes.client.exceptions import ApiException
+from kubernetes.stream import stream as k8s_stream, ws_client
 from ..config import config
 from ..models import FileUploadResponse
+from .k8s_service import k8s_service
 from ..utils.exceptions import (
     FileValidationError,
     FileTransferError,
@@ -22,12 +23,38 @@ from ..utils.exceptions import (
 )
 from ..utils.logger import upload_logger, log_async_function_call
 
+# 每次写入Pod stdin的数据块大小：块越大，WebSocket帧和Python调用次数越少；
+# 不超过K8s WebSocket最大消息大小的一半，为帧头留出余量
+UPLOAD_CHUNK_BYTES = min(1024 * 1024, config.k8s.max_size // 2)
+
+
+class _PodStdinWriter:
+    """将写入的数据转发到Pod exec的stdin通道，供流式tarfile作为输出文件使用"""
+
+    def __init__(self, resp):
+        self._resp = resp
+
+    def write(self, data: bytes) -> int:
+        self._resp.write_channel(ws_client.STDIN_CHANNEL, data)
+        return len(data)
+
 
 class FileUploadService:
     """文件上传服务类"""
 
     def __init__(self):
         self.target_dir = "/tmp"  # 目标目录
+        # 在 Pod 中执行的 tar 解包命令，目标目录固定，只需构造一次
+        self._tar_command = ("tar", "xf", "-", "-C", self.target_dir)
+        # 上传在整个传输期间占用线程，使用独立的有界线程池，
+        # 避免大文件或慢速上传占满K8s线程池、阻塞终端连接的建立
+        self._upload_executor = ThreadPoolExecutor(
+            max_workers=config.k8s.upload_workers, thread_name_prefix="upload"
+        )
+
+    def close(self) -> None:
+        """关闭上传线程池"""
+        self._upload_executor.shutdown(wait=False, cancel_futures=True)
 
     @log_async_function_call(upload_logger)
     async def validate_file(self, file: UploadFile) -> str:
@@ -54,40 +81,74 @@ class FileUploadService:
         upload_logger.info(f"文件验证通过: {safe_filename}")
         return safe_filename
 
-    @log_async_function_call(upload_logger)
-    async def save_temp_file(self, file: UploadFile) -> str:
-        """保存临时文件"""
-        try:
-            with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
-                shutil.copyfileobj(file.file, tmp_file)
-                tmp_file_path = tmp_file.name
-
-            upload_logger.info(f"文件已临时保存到: {tmp_file_path}")
-            return tmp_file_path
+    def _copy_to_pod(
+        self,
+        core_v1: kubernetes.client.CoreV1Api,
+        namespace: str,
+        podname: str,
+        file: UploadFile,
+        safe_filename: str,
+    ) -> int:
+        """在Pod中执行tar解包并以流式tar归档写入上传内容，返回tar命令的返回码（阻塞调用）
+
+        目标目录为/tmp，始终存在，因此不再单独执行mkdir
+        """
+        # 上传内容由Starlette缓存在SpooledTemporaryFile中（小文件在内存），直接读取，
+        # 不再另存临时文件、也不在内存中构造完整的tar归档
+        src = file.file
+        size = file.size
+        if size is None:
+            size = src.seek(0, os.SEEK_END)
+        src.seek(0)
+
+        resp_cp = k8s_stream(
+            core_v1.connect_get_namespaced_pod_exec,
+            podname,
+            namespace,
+            command=self._tar_command,
+            stderr=True,
+            stdin=True,
+            stdout=True,
+            tty=False,
+            _preload_content=False,
+        )
 
-        except Exception as e:
-            error_msg = f"保存临时文件失败: {e}"
-            upload_logger.error(error_msg)
-            raise FileTransferError(error_msg)
-
-    @log_async_function_call(upload_logger)
-    async def cleanup_temp_file(self, tmp_file_path: str) -> None:
-        """清理临时文件"""
         try:
-            if os.path.exists(tmp_file_path):
-                os.remove(tmp_file_path)
-                upload_logger.info(f"临时文件 {tmp_file_path} 已删除")
-        except Exception as e:
-            upload_logger.error(f"删除临时文件失败: {e}")
+            # 与原先写入临时文件后打包的结果保持一致：权限0600，修改时间为当前时间
+            tarinfo = tarfile.TarInfo(name=safe_filename)
+            tarinfo.type = tarfile.REGTYPE
+            tarinfo.size = size
+            tarinfo.mode = 0o600
+            tarinfo.mtime = int(time.time())
+
+            # 流式tar（"w|"）边打包边写入 Pod 的 stdin
+            with tarfile.open(
+                fileobj=_PodStdinWriter(resp_cp),
+                mode="w|",
+                format=tarfile.PAX_FORMAT,
+                bufsize=UPLOAD_CHUNK_BYTES,
+                copybufsize=UPLOAD_CHUNK_BYTES,
+            ) as tar:
+                tar.addfile(tarinfo, fileobj=src)
+
+            # 等待命令完成并检查输出/错误；update在有数据或连接关闭时立即返回
+            while resp_cp.is_open():
+                resp_cp.update(timeout=1)
+                if resp_cp.peek_stdout():
+                    upload_logger.info(f"CP STDOUT: {resp_cp.read_stdout()}")
+                if resp_cp.peek_stderr():
+                    stderr_output = resp_cp.read_stderr()
+                    upload_logger.warning(f"CP STDERR: {stderr_output}")
+        finally:
+            # 传输中途出错时也要关闭exec连接
+            resp_cp.close()
+        return resp_cp.returncode
 
     @log_async_function_call(upload_logger)
     async def upload_file(
         self, namespace: str, podname: str, file: UploadFile
     ) -> FileUploadResponse:
         """上传文件到Pod - 完全按照原版本main.py的实现"""
-        tmp_file_path = None
-        api_client = None
-
         try:
             # 验证文件
             safe_filename = await self.validate_file(file)
@@ -98,120 +159,53 @@ class FileUploadService:
                 f"destination={self.target_dir}/{safe_filename}"
             )
 
-            # 按照原版本方式重新加载K8s配置
-            if not os.path.exists(config.k8s.config_file):
-                error_msg = f"在 {config.k8s.config_file} 处未找到 Kubernetes 配置文件"
+            # 复用启动时初始化的共享ApiClient，不再每次上传都重新加载kubeconfig
+            if k8s_service.core_v1 is None:
+                error_msg = "Kubernetes客户端未初始化，无法上传文件"
                 upload_logger.error(error_msg)
                 return FileUploadResponse(error=error_msg, status_code=500)
 
-            try:
-                kubernetes.config.load_kube_config(config_file=config.k8s.config_file)
-                k8s_client_config = K8sConfiguration.get_default_copy()
-                k8s_client_config.verify_ssl = False
-                # 配置与 K8s API Server 的 WebSocket 连接的 ping/pong
-                k8s_client_config.websocket_client_params = {
-                    "ping_interval": 30,  # 每30秒发送一次ping
-                    "ping_timeout": 60,  # 60秒内未收到pong则超时
-                    "max_size": 10 * 1024 * 1024,  # 增加最大消息大小到10MB
-                    "skip_utf8_validation": True,  # 跳过UTF-8验证以提高性能
-                }
-                # 创建专用的ApiClient
-                api_client = kubernetes.client.ApiClient(
-                    configuration=k8s_client_config
-                )
-                # 创建专用的CoreV1Api
-                core_v1 = kubernetes.client.CoreV1Api(api_client=api_client)
-                upload_logger.info(
-                    "Kubernetes 配置已成功加载和自定义，忽略 SSL 证书验证，并已配置 WebSocket ping/pong (用于上传)。"
-                )
-            except Exception as e:
-                error_msg = f"加载 Kubernetes 配置时出错 (用于上传): {e}"
-                upload_logger.error(error_msg)
-                return FileUploadResponse(error=error_msg, status_code=500)
-
-            # 保存临时文件
-            tmp_file_path = await self.save_temp_file(file)
-
             pod_file_path = os.path.join(self.target_dir, safe_filename)
 
             try:
-                # 创建目标目录 (如果不存在)
-                mkdir_command = ["mkdir", "-p", self.target_dir]
-                resp_mkdir = kubernetes.stream.stream(
-                    core_v1.connect_get_namespaced_pod_exec,
-                    podname,
-                    namespace,
-                    command=mkdir_command,
-                    stderr=True,
-                    stdin=False,
-                    stdout=True,
-                    tty=False,
-                    _preload_content=False,
-                )
-                while resp_mkdir.is_open():
-                    resp_mkdir.update(timeout=1)
-                    if resp_mkdir.peek_stdout():
-                        upload_logger.info(f"MKDIR STDOUT: {resp_mkdir.read_stdout()}")
-                    if resp_mkdir.peek_stderr():
-                        upload_logger.warning(
-                            f"MKDIR STDERR: {resp_mkdir.read_stderr()}"
-                        )
-                resp_mkdir.close()
-                if resp_mkdir.returncode != 0:
-                    # 即使创建目录失败，也尝试复制，tar可能会创建目录
-                    upload_logger.warning(
-                        f"在 Pod 中创建目录 {self.target_dir} 可能失败，返回码: {resp_mkdir.returncode}"
-                    )
-
-                # 创建一个包含单个文件的 tar 归档流
-                tar_stream = io.BytesIO()
-                with tarfile.open(fileobj=tar_stream, mode="w") as tar:
-                    tar.add(tmp_file_path, arcname=safe_filename)
-                tar_stream.seek(0)
-
-                # 在 Pod 中执行 tar 命令以提取文件
-                exec_command = ["tar", "xf", "-", "-C", self.target_dir]
-
-                resp_cp = kubernetes.stream.stream(
-                    core_v1.connect_get_namespaced_pod_exec,
-                    podname,
-                    namespace,
-                    command=exec_command,
-                    stderr=True,
-                    stdin=True,
-                    stdout=True,
-                    tty=False,
-                    _preload_content=False,
-                )
-
                 upload_logger.info(
                     f"向 Pod {podname} 的 {self.target_dir} 目录传输文件 {safe_filename} (目标名: {safe_filename})"
                 )
 
-                # 将 tar 流写入到 Pod 的 stdin
-                buffer_size = 4096  # 4KB 缓冲区
+                # 最多尝试2次（初始尝试 + 1次重试）
+                max_retries = 1
+                retry_count = 0
+
                 while True:
-                    data_chunk = tar_stream.read(buffer_size)
-                    if not data_chunk:
+                    core_v1 = k8s_service.core_v1
+                    try:
+                        # exec连接与数据传输均为阻塞调用，放到上传专用线程池中执行
+                        returncode = await asyncio.get_running_loop().run_in_executor(
+                            self._upload_executor,
+                            self._copy_to_pod,
+                            core_v1,
+                            namespace,
+                            podname,
+                            file,
+                            safe_filename,
+                        )
                         break
-                    resp_cp.write_channel(ws_client.STDIN_CHANNEL, data_chunk)
-
-                tar_stream.close()
-
-                # 等待命令完成并检查输出/错误
-                while resp_cp.is_open():
-                    resp_cp.update(timeout=1)
-                    if resp_cp.peek_stdout():
-                        upload_logger.info(f"CP STDOUT: {resp_cp.read_stdout()}")
-                    if resp_cp.peek_stderr():
-                        stderr_output = resp_cp.read_stderr()
-                        upload_logger.warning(f"CP STDERR: {stderr_output}")
-                resp_cp.close()
-
-                if resp_cp.returncode != 0:
-                    error_msg = (
-                        f"在 Pod 中复制文件失败。Tar 命令返回码: {resp_cp.returncode}"
-                    )
+                    except Exception as e:
+                        # SSL证书文件错误发生在建立exec连接时，尚未写入数据，可以重新初始化后重试
+                        if (
+                            k8s_service.is_cert_file_error(e)
+                            and retry_count < max_retries
+                        ):
+                            upload_logger.warning(
+                                f"上传时检测到SSL证书文件错误，尝试重新初始化连接: {e}"
+                            )
+                            retry_count += 1
+                            await k8s_service.reinitialize_async(core_v1.api_client)
+                            continue
+                        raise
+
+                if returncode != 0:
+                    error_msg = f"在 Pod 中复制文件失败。Tar 命令返回码: {returncode}"
                     upload_logger.error(error_msg)
                     return FileUploadResponse(error=error_msg, status_code=500)
 
@@ -222,7 +216,7 @@ class FileUploadService:
                     message=f"文件 {safe_filename} 已成功上传到 {pod_file_path}"
                 )
 
-            except kubernetes.client.exceptions.ApiException as e:
+            except ApiException as e:
                 error_msg = f"Kubernetes API 错误: {e}"
                 upload_logger.error(error_msg)
                 return FileUploadResponse(error=error_msg, status_code=500)
@@ -245,21 +239,12 @@ class FileUploadService:
             upload_logger.error(error_msg)
             return FileUploadResponse(error=error_msg, status_code=500)
 
-        finally:
-            # 关闭ApiClient
-            if api_client:
-                try:
-                    api_client.close()
-                    upload_logger.debug("上传服务ApiClient已关闭")
-                except Exception as close_err:
-                    upload_logger.error(f"关闭上传服务ApiClient时出错: {close_err}")
 
-            # 清理临时文件
-            if tmp_file_path:
-                await self.cleanup_temp_file(tmp_file_path)
+# 全局文件上传服务实例
+upload_service = FileUploadService()
 
 
 # 创建文件上传服务实例的工厂函数
 def create_upload_service() -> FileUploadService:
-    """创建文件上传服务实例 - 不再需要k8s_service参数"""
-    return FileUploadService()
+    """获取文件上传服务实例（无状态，所有请求共用同一个实例）"""
+    return upload_service
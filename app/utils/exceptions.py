@@ -4,24 +4,59 @@
 """
 
 
+def _restore_exception(cls, args: tuple, slot_values: tuple, attrs: dict):
+    """按__reduce__保存的参数和槽值重建异常实例，不调用子类的__init__"""
+    exc = cls.__new__(cls, *args)
+    exc.args = args
+    for owner, name, value in slot_values:
+        owner.__dict__[name].__set__(exc, value)
+    if attrs:
+        exc.__dict__.update(attrs)
+    return exc
+
+
 class BaseAppException(Exception):
-    """应用基础异常类"""
+    """应用基础异常类
+
+    全部子类都声明__slots__，属性存放在槽中，不再为每个异常实例创建__dict__
+    """
+
+    __slots__ = ("message", "error_code")
 
     def __init__(self, message: str, error_code: str = None):
         self.message = message
         self.error_code = error_code
         super().__init__(self.message)
 
+    def __reduce__(self):
+        # Exception默认的__reduce__只保存args和__dict__，槽中的属性会丢失，
+        # 且用args重新调用__init__对ConfigNotFoundError等子类并不成立；
+        # 这里直接保存各层的槽值，保证pickle和copy前后属性一致
+        slot_values = []
+        for owner in type(self).__mro__:
+            for name in owner.__dict__.get("__slots__", ()):
+                try:
+                    value = owner.__dict__[name].__get__(self, owner)
+                except AttributeError:
+                    continue
+                slot_values.append((owner, name, value))
+        return (
+            _restore_exception,
+            (type(self), self.args, tuple(slot_values), self.__dict__ or None),
+        )
+
 
 class DatabaseException(BaseAppException):
     """数据库相关异常"""
 
-    pass
+    __slots__ = ()
 
 
 class DatabaseConnectionError(DatabaseException):
     """数据库连接错误"""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "数据库连接失败"):
         super().__init__(message, "DB_CONNECTION_ERROR")
 
@@ -29,6 +64,8 @@ class DatabaseConnectionError(DatabaseException):
 class DatabaseOperationError(DatabaseException):
     """数据库操作错误"""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "数据库操作失败"):
         super().__init__(message, "DB_OPERATION_ERROR")
 
@@ -36,12 +73,14 @@ class DatabaseOperationError(DatabaseException):
 class KubernetesException(BaseAppException):
     """Kubernetes相关异常"""
 
-    pass
+    __slots__ = ()
 
 
 class K8sConnectionError(KubernetesException):
     """Kubernetes连接错误"""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "Kubernetes连接失败"):
         super().__init__(message, "K8S_CONNECTION_ERROR")
 
@@ -49,37 +88,69 @@ class K8sConnectionError(KubernetesException):
 class K8sConfigError(KubernetesException):
     """Kubernetes配置错误"""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "Kubernetes配置错误"):
         super().__init__(message, "K8S_CONFIG_ERROR")
 
 
 class PodNotFoundError(KubernetesException):
-    """Pod未找到错误"""
+    """Pod未找到错误
+
+    该异常在重试和缓存快速失败路径中频繁创建，多数只被捕获后转换，
+    因此只保存参数，错误信息在读取message或转为字符串时才格式化
+    """
+
+    __slots__ = ("podname", "namespace")
 
     def __init__(self, podname: str, namespace: str):
-        message = f"Pod '{podname}' 在命名空间 '{namespace}' 中未找到"
-        super().__init__(message, "POD_NOT_FOUND")
+        self.podname = podname
+        self.namespace = namespace
+        self.error_code = "POD_NOT_FOUND"
+        Exception.__init__(self, podname, namespace)
+
+    @property
+    def message(self) -> str:
+        return f"Pod '{self.podname}' 在命名空间 '{self.namespace}' 中未找到"
+
+    def __str__(self) -> str:
+        return self.message
 
 
 class PodConnectionError(KubernetesException):
-    """Pod连接错误"""
+    """Pod连接错误（错误信息延迟格式化，同PodNotFoundError）"""
+
+    __slots__ = ("podname", "namespace", "reason")
 
     def __init__(self, podname: str, namespace: str, reason: str = ""):
-        message = f"无法连接到Pod '{podname}' (命名空间: '{namespace}')"
-        if reason:
-            message += f": {reason}"
-        super().__init__(message, "POD_CONNECTION_ERROR")
+        self.podname = podname
+        self.namespace = namespace
+        self.reason = reason
+        self.error_code = "POD_CONNECTION_ERROR"
+        Exception.__init__(self, podname, namespace, reason)
+
+    @property
+    def message(self) -> str:
+        message = f"无法连接到Pod '{self.podname}' (命名空间: '{self.namespace}')"
+        if self.reason:
+            message += f": {self.reason}"
+        return message
+
+    def __str__(self) -> str:
+        return self.message
 
 
 class WebSocketException(BaseAppException):
     """WebSocket相关异常"""
 
-    pass
+    __slots__ = ()
 
 
 class WebSocketConnectionError(WebSocketException):
     """WebSocket连接错误"""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "WebSocket连接失败"):
         super().__init__(message, "WS_CONNECTION_ERROR")
 
@@ -87,6 +158,8 @@ class WebSocketConnectionError(WebSocketException):
 class WebSocketTimeoutError(WebSocketException):
     """WebSocket超时错误"""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "WebSocket连接超时"):
         super().__init__(message, "WS_TIMEOUT_ERROR")
 
@@ -94,12 +167,14 @@ class WebSocketTimeoutError(WebSocketException):
 class FileUploadException(BaseAppException):
     """文件上传相关异常"""
 
-    pass
+    __slots__ = ()
 
 
 class FileValidationError(FileUploadException):
     """文件验证错误"""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "文件验证失败"):
         super().__init__(message, "FILE_VALIDATION_ERROR")
 
@@ -107,6 +182,8 @@ class FileValidationError(FileUploadException):
 class FileTransferError(FileUploadException):
     """文件传输错误"""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "文件传输失败"):
         super().__init__(message, "FILE_TRANSFER_ERROR")
 
@@ -114,12 +191,14 @@ class FileTransferError(FileUploadException):
 class ConfigurationException(BaseAppException):
     """配置相关异常"""
 
-    pass
+    __slots__ = ()
 
 
 class ConfigNotFoundError(ConfigurationException):
     """配置文件未找到错误"""
 
+    __slots__ = ()
+
     def __init__(self, config_path: str):
         message = f"配置文件未找到: {config_path}"
         super().__init__(message, "CONFIG_NOT_FOUND")
@@ -128,6 +207,8 @@ class ConfigNotFoundError(ConfigurationException):
 class InvalidConfigError(ConfigurationException):
     """无效配置错误"""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "配置无效"):
         super().__init__(message, "INVALID_CONFIG")
 
@@ -135,28 +216,42 @@ class InvalidConfigError(ConfigurationException):
 class ValidationException(BaseAppException):
     """验证异常"""
 
-    pass
+    __slots__ = ()
 
 
 class ParameterValidationError(ValidationException):
-    """参数验证错误"""
+    """参数验证错误（错误信息延迟格式化，同PodNotFoundError）"""
+
+    __slots__ = ("parameter", "detail")
 
     def __init__(self, parameter: str, message: str = ""):
-        full_message = f"参数 '{parameter}' 验证失败"
-        if message:
-            full_message += f": {message}"
-        super().__init__(full_message, "PARAMETER_VALIDATION_ERROR")
+        self.parameter = parameter
+        self.detail = message
+        self.error_code = "PARAMETER_VALIDATION_ERROR"
+        Exception.__init__(self, parameter, message)
+
+    @property
+    def message(self) -> str:
+        full_message = f"参数 '{self.parameter}' 验证失败"
+        if self.detail:
+            full_message += f": {self.detail}"
+        return full_message
+
+    def __str__(self) -> str:
+        return self.message
 
 
 class AuthenticationException(BaseAppException):
     """认证相关异常"""
 
-    pass
+    __slots__ = ()
 
 
 class UnauthorizedError(AuthenticationException):
     """未授权错误"""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "未授权访问"):
         super().__init__(message, "UNAUTHORIZED")
 
@@ -164,6 +259,8 @@ class UnauthorizedError(AuthenticationException):
 class ForbiddenError(AuthenticationException):
     """禁止访问错误"""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "访问被禁止"):
         super().__init__(message, "FORBIDDEN")
 
@@ -171,12 +268,14 @@ class ForbiddenError(AuthenticationException):
 class ServiceException(BaseAppException):
     """服务相关异常"""
 
-    pass
+    __slots__ = ()
 
 
 class ServiceUnavailableError(ServiceException):
     """服务不可用错误"""
 
+    __slots__ = ()
+
     def __init__(self, service_name: str):
         message = f"服务 '{service_name}' 不可用"
         super().__init__(message, "SERVICE_UNAVAILABLE")
@@ -185,5 +284,7 @@ class ServiceUnavailableError(ServiceException):
 class InternalServerError(ServiceException):
     """内部服务器错误"""
 
+    __slots__ = ()
+
     def __init__(self, message: str = "内部服务器错误"):
         super().__init__(message, "INTERNAL_SERVER_ERROR")
@@ -4,38 +4,79 @@
 """
 
 import os
+import queue
+import functools
 import logging
 import logging.handlers
+import threading
 from typing import Optional
 from ..config import config
 
+# 日志级别和格式由配置在启动时确定，只计算一次，所有日志记录器和处理器共用
+_LEVEL = getattr(logging, config.log.log_level.upper())
+_FORMATTER = logging.Formatter(config.log.log_format, datefmt=config.log.date_format)
+
 
 class Logger:
-    """日志管理类"""
+    """日志管理类
+
+    各日志记录器只挂载QueueHandler，记录放入队列即返回；真正的文件/控制台输出由
+    QueueListener在后台线程中完成，避免在事件循环线程上执行磁盘写入和滚动检查
+    """
+
+    _queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    _listener: Optional[logging.handlers.QueueListener] = None
+    _buffered_handler: Optional[logging.handlers.MemoryHandler] = None
+    _listener_lock = threading.Lock()
+    _setup_lock = threading.Lock()
 
-    _loggers = {}
+    @staticmethod
+    def get_logger(name: str) -> logging.Logger:
+        """获取日志记录器（兼容旧接口，转发到模块级get_logger）"""
+        return get_logger(name)
 
     @classmethod
-    def get_logger(cls, name: str) -> logging.Logger:
-        """获取日志记录器"""
-        if name not in cls._loggers:
-            cls._loggers[name] = cls._setup_logger(name)
-        return cls._loggers[name]
+    def _ensure_listener(cls) -> None:
+        """创建并启动后台日志线程（所有日志记录器共用一组输出处理器）"""
+        with cls._listener_lock:
+            if cls._listener is not None:
+                return
+
+            # 创建控制台处理器
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(_FORMATTER)
+
+            if config.log.remote_host:
+                # 日志发送给进程外的收集端，由收集端负责落盘和滚动
+                output_handler = cls._create_remote_handler()
+            else:
+                output_handler = cls._create_file_handler()
+
+            cls._listener = logging.handlers.QueueListener(
+                cls._queue,
+                output_handler,
+                console_handler,
+                respect_handler_level=True,
+            )
+            cls._listener.start()
+
+    @staticmethod
+    def _create_remote_handler() -> logging.Handler:
+        """创建发送到远程日志收集端的处理器（收到的是LogRecord，格式化由收集端完成）"""
+        if config.log.remote_protocol == "tcp":
+            return logging.handlers.SocketHandler(
+                config.log.remote_host, config.log.remote_port
+            )
+        return logging.handlers.DatagramHandler(
+            config.log.remote_host, config.log.remote_port
+        )
 
     @classmethod
-    def _setup_logger(cls, name: str) -> logging.Logger:
-        """设置日志记录器"""
+    def _create_file_handler(cls) -> logging.Handler:
+        """创建带内存缓冲的本地文件处理器"""
         # 确保日志目录存在
         os.makedirs(config.log.log_dir, exist_ok=True)
 
-        # 创建日志记录器
-        logger = logging.getLogger(name)
-        logger.setLevel(getattr(logging, config.log.log_level.upper()))
-
-        # 避免重复添加处理器
-        if logger.handlers:
-            return logger
-
         # 创建文件处理器
         file_handler = logging.handlers.RotatingFileHandler(
             os.path.join(config.log.log_dir, config.log.log_file),
@@ -43,55 +84,103 @@ class Logger:
             backupCount=config.log.backup_count,
             encoding="utf-8",
         )
-
-        # 创建控制台处理器
-        console_handler = logging.StreamHandler()
-
-        # 设置日志格式
-        formatter = logging.Formatter(
-            config.log.log_format, datefmt=config.log.date_format
+        file_handler.setFormatter(_FORMATTER)
+
+        # 文件输出先在内存中缓冲，攒满一批或遇到ERROR级别时再批量写入；
+        # 另由flush()定时刷新，避免低流量时日志长时间停留在内存中
+        cls._buffered_handler = logging.handlers.MemoryHandler(
+            capacity=config.log.buffer_capacity,
+            flushLevel=logging.ERROR,
+            target=file_handler,
+            flushOnClose=True,
         )
+        return cls._buffered_handler
 
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
+    @classmethod
+    def _setup_logger(cls, name: str) -> logging.Logger:
+        """设置日志记录器"""
+        cls._ensure_listener()
 
-        # 添加处理器到日志记录器
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        # 创建日志记录器
+        logger = logging.getLogger(name)
+        logger.setLevel(_LEVEL)
+
+        # 只检查本模块的队列处理器：第三方库可能已为同名记录器添加NullHandler
+        # （如websocket-client），不能因此跳过设置；
+        # lru_cache在并发未命中时可能重复调用，加锁保证处理器只添加一次
+        with cls._setup_lock:
+            if not any(
+                isinstance(h, logging.handlers.QueueHandler) and h.queue is cls._queue
+                for h in logger.handlers
+            ):
+                # 添加队列处理器到日志记录器
+                logger.addHandler(logging.handlers.QueueHandler(cls._queue))
 
         return logger
 
+    @classmethod
+    def flush(cls) -> None:
+        """将缓冲中的文件日志写入磁盘（会执行文件写入，不要在事件循环线程中直接调用）"""
+        if cls._buffered_handler is not None:
+            cls._buffered_handler.flush()
+
     @classmethod
     def shutdown(cls):
-        """关闭所有日志记录器"""
+        """关闭所有日志记录器（先停止后台线程，确保队列和缓冲中的日志全部写出）"""
+        with cls._listener_lock:
+            if cls._listener is not None:
+                cls._listener.stop()
+                cls._listener = None
+            if cls._buffered_handler is not None:
+                cls._buffered_handler.close()
+                cls._buffered_handler = None
         logging.shutdown()
 
 
+@functools.lru_cache(maxsize=None)
+def get_logger(name: str) -> logging.Logger:
+    """获取日志记录器（按名称缓存，已创建的直接返回，不再经过logging.getLogger的全局锁）"""
+    return Logger._setup_logger(name)
+
+
 # 预定义的日志记录器
-app_logger = Logger.get_logger("k8s_web_terminal")
-db_logger = Logger.get_logger("database")
-k8s_logger = Logger.get_logger("kubernetes")
-ws_logger = Logger.get_logger("websocket")
-upload_logger = Logger.get_logger("upload")
+app_logger = get_logger("k8s_web_terminal")
+db_logger = get_logger("database")
+k8s_logger = get_logger("kubernetes")
+ws_logger = get_logger("websocket")
+upload_logger = get_logger("upload")
 
 
 def log_function_call(logger: logging.Logger = None):
     """函数调用日志装饰器"""
 
     def decorator(func):
-        def wrapper(*args, **kwargs):
-            if logger is None:
-                current_logger = app_logger
-            else:
-                current_logger = logger
+        # 日志记录器和函数名在装饰时确定，调用时不再重复判断
+        current_logger = logger or app_logger
+        func_name = func.__name__
+
+        # 日志级别在启动时由配置确定，未开启DEBUG时只保留异常日志
+        if not current_logger.isEnabledFor(logging.DEBUG):
 
-            current_logger.debug(f"调用函数: {func.__name__}")
+            @functools.wraps(func)
+            def error_wrapper(*args, **kwargs):
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    current_logger.error("函数 %s 执行失败: %s", func_name, e)
+                    raise
+
+            return error_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            current_logger.debug("调用函数: %s", func_name)
             try:
                 result = func(*args, **kwargs)
-                current_logger.debug(f"函数 {func.__name__} 执行成功")
+                current_logger.debug("函数 %s 执行成功", func_name)
                 return result
             except Exception as e:
-                current_logger.error(f"函数 {func.__name__} 执行失败: {e}")
+                current_logger.error("函数 %s 执行失败: %s", func_name, e)
                 raise
 
         return wrapper
@@ -103,19 +192,32 @@ def log_async_function_call(logger: logging.Logger = None):
     """异步函数调用日志装饰器"""
 
     def decorator(func):
-        async def wrapper(*args, **kwargs):
-            if logger is None:
-                current_logger = app_logger
-            else:
-                current_logger = logger
+        # 日志记录器和函数名在装饰时确定，调用时不再重复判断
+        current_logger = logger or app_logger
+        func_name = func.__name__
 
-            current_logger.debug(f"调用异步函数: {func.__name__}")
+        # 日志级别在启动时由配置确定，未开启DEBUG时只保留异常日志
+        if not current_logger.isEnabledFor(logging.DEBUG):
+
+            @functools.wraps(func)
+            async def error_wrapper(*args, **kwargs):
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    current_logger.error("异步函数 %s 执行失败: %s", func_name, e)
+                    raise
+
+            return error_wrapper
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            current_logger.debug("调用异步函数: %s", func_name)
             try:
                 result = await func(*args, **kwargs)
-                current_logger.debug(f"异步函数 {func.__name__} 执行成功")
+                current_logger.debug("异步函数 %s 执行成功", func_name)
                 return result
             except Exception as e:
-                current_logger.error(f"异步函数 {func.__name__} 执行失败: {e}")
+                current_logger.error("异步函数 %s 执行失败: %s", func_name, e)
                 raise
 
         return wrapper
@@ -126,7 +228,11 @@ def log_async_function_call(logger: logging.Logger = None):
 def log_terminal_operation(username: str, namespace: str, podname: str, action: str):
     """记录终端操作日志"""
     app_logger.info(
-        f"终端操作 - 用户: {username}, 命名空间: {namespace}, Pod: {podname}, 操作: {action}"
+        "终端操作 - 用户: %s, 命名空间: %s, Pod: %s, 操作: %s",
+        username,
+        namespace,
+        podname,
+        action,
     )
 
 
@@ -135,31 +241,59 @@ def log_file_upload(
 ):
     """记录文件上传日志"""
     upload_logger.info(
-        f"文件上传 - 用户: {username}, 命名空间: {namespace}, Pod: {podname}, 文件: {filename}, 状态: {status}"
+        "文件上传 - 用户: %s, 命名空间: %s, Pod: %s, 文件: %s, 状态: %s",
+        username,
+        namespace,
+        podname,
+        filename,
+        status,
     )
 
 
 def log_database_operation(operation: str, status: str, details: str = ""):
     """记录数据库操作日志"""
-    message = f"数据库操作 - 操作: {operation}, 状态: {status}"
     if details:
-        message += f", 详情: {details}"
-    db_logger.info(message)
+        db_logger.info(
+            "数据库操作 - 操作: %s, 状态: %s, 详情: %s", operation, status, details
+        )
+    else:
+        db_logger.info("数据库操作 - 操作: %s, 状态: %s", operation, status)
 
 
 def log_k8s_operation(
     operation: str, namespace: str, podname: str, status: str, details: str = ""
 ):
     """记录Kubernetes操作日志"""
-    message = f"K8s操作 - 操作: {operation}, 命名空间: {namespace}, Pod: {podname}, 状态: {status}"
     if details:
-        message += f", 详情: {details}"
-    k8s_logger.info(message)
+        k8s_logger.info(
+            "K8s操作 - 操作: %s, 命名空间: %s, Pod: %s, 状态: %s, 详情: %s",
+            operation,
+            namespace,
+            podname,
+            status,
+            details,
+        )
+    else:
+        k8s_logger.info(
+            "K8s操作 - 操作: %s, 命名空间: %s, Pod: %s, 状态: %s",
+            operation,
+            namespace,
+            podname,
+            status,
+        )
 
 
 def log_websocket_event(event: str, namespace: str, podname: str, details: str = ""):
     """记录WebSocket事件日志"""
-    message = f"WebSocket事件 - 事件: {event}, 命名空间: {namespace}, Pod: {podname}"
     if details:
-        message += f", 详情: {details}"
-    ws_logger.info(message)
+        ws_logger.info(
+            "WebSocket事件 - 事件: %s, 命名空间: %s, Pod: %s, 详情: %s",
+            event,
+            namespace,
+            podname,
+            details,
+        )
+    else:
+        ws_logger.info(
+            "WebSocket事件 - 事件: %s, 命名空间: %s, Pod: %s", event, namespace, podname
+        )
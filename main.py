@@ -6,12 +6,13 @@ K8s Web Terminal 应用入口
 from fastapi import FastAPI, HTTPException, UploadFile, File, Path
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
 
 from app.config import config
-from app.api.terminal import router as terminal_router
+from app.api.terminal import router as terminal_router, websocket_handler
 from app.services.database import db_service
 from app.services.k8s_service import k8s_service
 from app.services.upload_service import create_upload_service
@@ -20,45 +21,70 @@ from app.utils.exceptions import BaseAppException
 from app.utils.logger import app_logger, Logger
 
 
+async def flush_logs_periodically():
+    """定时将缓冲中的文件日志写入磁盘（在线程中执行，不阻塞事件循环）"""
+    while True:
+        await asyncio.sleep(config.log.flush_interval)
+        await asyncio.to_thread(Logger.flush)
+
+
+async def _init_db():
+    """初始化数据库服务"""
+    await db_service.initialize()
+    app_logger.info("数据库服务初始化完成")
+
+
+async def _init_k8s():
+    """初始化Kubernetes服务（加载kubeconfig、写入证书等阻塞操作在线程中执行）"""
+    await asyncio.to_thread(k8s_service.initialize)
+    app_logger.info("Kubernetes服务初始化完成")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """应用生命周期管理"""
     # 启动时初始化
     app_logger.info("正在启动 K8s Web Terminal 应用...")
 
-    try:
-        # 初始化数据库服务
-        await db_service.initialize()
-        app_logger.info("数据库服务初始化完成")
-
-        # 初始化Kubernetes服务
-        k8s_service.initialize()
-        app_logger.info("Kubernetes服务初始化完成")
+    # Python 3.12+：新建任务立即执行到第一次挂起，省去一次事件循环调度
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_task_factory is not None:
+        asyncio.get_running_loop().set_task_factory(eager_task_factory)
+
+    # 数据库和Kubernetes服务互不依赖，并发初始化；等待两者都结束后再处理失败，
+    # 避免清理时另一个初始化仍在进行（线程中的初始化无法取消），导致资源泄漏
+    results = await asyncio.gather(_init_db(), _init_k8s(), return_exceptions=True)
+    error = next((r for r in results if isinstance(r, BaseException)), None)
+    if error is not None:
+        app_logger.error(f"应用启动失败: {error}")
+        # 清理已初始化的服务
+        await asyncio.gather(
+            db_service.close(),
+            asyncio.to_thread(k8s_service.close),
+            return_exceptions=True,
+        )
+        raise error
 
-        app_logger.info("K8s Web Terminal 应用启动成功")
+    app_logger.info("K8s Web Terminal 应用启动成功")
 
-    except Exception as e:
-        app_logger.error(f"应用启动失败: {e}")
-        # 清理已初始化的服务
-        try:
-            await db_service.close()
-            k8s_service.close()
-        except Exception:
-            pass
-        raise
+    log_flush_task = asyncio.create_task(flush_logs_periodically())
 
     yield  # 应用运行
 
     # 关闭时清理
     app_logger.info("正在关闭 K8s Web Terminal 应用...")
+    log_flush_task.cancel()
 
     try:
-        await db_service.close()
-        k8s_service.close()
-        Logger.shutdown()
+        await asyncio.gather(db_service.close(), asyncio.to_thread(k8s_service.close))
+        websocket_handler.close()
+        create_upload_service().close()
         app_logger.info("K8s Web Terminal 应用已安全关闭")
     except Exception as e:
         app_logger.error(f"应用关闭时出错: {e}")
+    finally:
+        # 最后关闭日志，后台日志线程会先写完队列中的记录
+        Logger.shutdown()
 
 
 # 创建FastAPI应用
@@ -91,6 +117,8 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
+    # 使用orjson序列化JSON响应，健康检查等高频端点的序列化开销更低
+    default_response_class=ORJSONResponse,
 )
 
 # 配置CORS中间件
@@ -106,10 +134,33 @@ app.add_middleware(
 app.mount("/static", StaticFiles(directory="templates/static"), name="static")
 
 # 注册路由
-app.include_router(terminal_router, prefix="/api/v1")
+API_PREFIX = "/api/v1"
+app.include_router(terminal_router, prefix=API_PREFIX)
+
+
+class LegacyPathRewriteMiddleware:
+    """兼容原始路由（保持向后兼容）
+
+    终端路由只在/api/v1下注册一次，旧路径在进入路由匹配前改写为带前缀的路径，
+    避免同一组路由重复注册导致路由表和OpenAPI文档翻倍。
+    同时处理HTTP和WebSocket请求，因此使用纯ASGI中间件而不是@app.middleware("http")
+    """
 
-# 兼容原始路由（保持向后兼容）
-app.include_router(terminal_router)
+    LEGACY_PATHS = frozenset({"/connect"})
+    LEGACY_PREFIXES = ("/ws/",)
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket"):
+            path = scope["path"]
+            if path in self.LEGACY_PATHS or path.startswith(self.LEGACY_PREFIXES):
+                scope = dict(scope, path=API_PREFIX + path)
+        await self.app(scope, receive, send)
+
+
+app.add_middleware(LegacyPathRewriteMiddleware)
 
 
 @app.get("/health", response_model=HealthCheckResponse, summary="健康检查")
@@ -150,14 +201,10 @@ async def health_check():
         )
 
 
-@app.get("/", summary="根路径")
-async def root():
-    """
-    根路径端点
-
-    返回API基本信息和可用端点
-    """
-    return APIResponse(
+# 根路径和版本信息的内容固定，启动时序列化一次，请求时直接返回字节，
+# 不再每次构造和校验APIResponse模型
+_ROOT_BYTES = ORJSONResponse(
+    APIResponse(
         success=True,
         message="K8s Web Terminal API",
         data={
@@ -172,22 +219,37 @@ async def root():
                 "websocket": "/ws/{namespace}/{podname}",
             },
         },
-    )
-
+    ).model_dump()
+).body
 
-@app.get("/version", summary="版本信息")
-async def get_version():
-    """获取应用版本信息"""
-    return APIResponse(
+_VERSION_BYTES = ORJSONResponse(
+    APIResponse(
         success=True,
         message="版本信息",
         data={
             "version": "1.0.0",
             "build_time": "2024-08-27",
-            "python_version": "3.8+",
+            "python_version": "3.10+",
             "fastapi_version": "0.104.1",
         },
-    )
+    ).model_dump()
+).body
+
+
+@app.get("/", response_model=APIResponse, summary="根路径")
+async def root():
+    """
+    根路径端点
+
+    返回API基本信息和可用端点
+    """
+    return Response(content=_ROOT_BYTES, media_type="application/json")
+
+
+@app.get("/version", response_model=APIResponse, summary="版本信息")
+async def get_version():
+    """获取应用版本信息"""
+    return Response(content=_VERSION_BYTES, media_type="application/json")
 
 
 # 全局异常处理器
@@ -195,7 +257,7 @@ async def get_version():
 async def app_exception_handler(request, exc: BaseAppException):
     """处理自定义应用异常"""
     app_logger.error(f"应用异常: {exc.message} (错误码: {exc.error_code})")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=400,
         content={
             "success": False,
@@ -217,24 +279,15 @@ async def upload_file_to_pod_compat(
     file: UploadFile = File(..., description="要上传的文件"),
 ) -> FileUploadResponse:
     """兼容原版本的文件上传端点"""
-    # 使用与原版本完全相同的logger和日志格式
-    import logging
-
-    logger = logging.getLogger("k8s_web_terminal")
-
-    # 确保logger有合适的处理器
-    if not logger.handlers:
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-        logger.setLevel(logging.INFO)
-
-    logger.info(
-        f"接收到文件上传请求: namespace={namespace}, podname={podname}, original_filename={file.filename}, safe_filename={file.filename}, destination=/tmp/{file.filename}"
+    # app_logger即原版本使用的"k8s_web_terminal"记录器，导入时已完成配置
+    app_logger.info(
+        "接收到文件上传请求: namespace=%s, podname=%s, original_filename=%s, "
+        "safe_filename=%s, destination=/tmp/%s",
+        namespace,
+        podname,
+        file.filename,
+        file.filename,
+        file.filename,
     )
 
     try:
@@ -244,18 +297,18 @@ async def upload_file_to_pod_compat(
 
         # 如果有错误，抛出HTTP异常
         if result.error:
-            logger.error(f"上传失败: {result.error}")
+            app_logger.error("上传失败: %s", result.error)
             raise HTTPException(
                 status_code=result.status_code or 500, detail=result.error
             )
 
-        logger.info(f"上传成功: {result.message}")
+        app_logger.info("上传成功: %s", result.message)
         return result
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"上传过程中发生未知错误: {e}")
+        app_logger.error("上传过程中发生未知错误: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -263,7 +316,7 @@ async def upload_file_to_pod_compat(
 async def general_exception_handler(request, exc: Exception):
     """处理通用异常"""
     app_logger.error(f"未处理的异常: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "success": False,
@@ -281,9 +334,11 @@ if __name__ == "__main__":
         "main:app",
         host=config.server.host,
         port=config.server.port,
+        loop=config.server.loop,
         ws_ping_interval=config.websocket.ping_interval,
         ws_ping_timeout=config.websocket.ping_timeout,
         timeout_keep_alive=config.websocket.timeout_keep_alive,
+        ws_per_message_deflate=config.websocket.per_message_deflate,
         limit_concurrency=config.server.limit_concurrency,
         limit_max_requests=config.server.limit_max_requests,
         workers=1,  # WebSocket应用建议使用单worker